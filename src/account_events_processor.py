@@ -5,15 +5,20 @@ Processes events for a specific account and prepares them for Bedrock analysis
 import json
 import os
 import traceback
+from collections import Counter
 from datetime import datetime
 
+# Services whose events are dropped, parsed once per container
+EXCLUDED_SERVICES = frozenset(s.strip() for s in os.environ.get('EXCLUDED_SERVICES', '').split(',') if s.strip())
+
 
 def lambda_handler(event, context):
     """
     Process events for a specific account
     """
     try:
-        print(f"Processing account events: {json.dumps(event, default=str)}")
+        # Log the payload shape only - serializing every event just for logging is costly
+        print(f"Processing account events, payload keys: {list(event.keys())}")
         
         workflow_id = event['workflow_id']
         account_id = event['account_id']
@@ -52,33 +57,43 @@ def lambda_handler(event, context):
 def process_account_events(events, account_id):
     """
     Apply business logic and filtering to account events
+    
+    Events are annotated in place - they are deserialized from this invocation's
+    input and not used elsewhere, so copying them first would only add allocations.
     """
     processed_events = []
-    excluded_services = get_excluded_services()
+    processed_at = datetime.now().isoformat()  # Same timestamp for the whole batch
+    excluded_count = 0
+    missing_description_arns = []
     
     for event in events:
         # Skip excluded services
         service = event.get('service', '')
-        if service in excluded_services:
-            print(f"Skipping event for excluded service: {service}")
+        if service in EXCLUDED_SERVICES:
+            excluded_count += 1
             continue
         
-        # Add processing metadata
-        processed_event = event.copy()
-        processed_event['processed_at'] = datetime.now().isoformat()
-        processed_event['processor'] = 'account_events_processor'
-        
         # Debug: Check if eventDescription is present
-        if not processed_event.get('eventDescription'):
-            print(f"Warning: Event {event.get('arn', 'unknown')} has no eventDescription")
+        if not event.get('eventDescription'):
+            missing_description_arns.append(event.get('arn', 'unknown'))
         
-        # Categorize event severity based on status and type
-        processed_event['severity'] = categorize_event_severity(event)
+        # Categorize event severity and extract key information for analysis
+        # before adding processing metadata, so both only see the original fields
+        severity = categorize_event_severity(event)
+        analysis_summary = extract_analysis_summary(event)
         
-        # Extract key information for analysis
-        processed_event['analysis_summary'] = extract_analysis_summary(event)
+        # Add processing metadata
+        event['processed_at'] = processed_at
+        event['processor'] = 'account_events_processor'
+        event['severity'] = severity
+        event['analysis_summary'] = analysis_summary
         
-        processed_events.append(processed_event)
+        processed_events.append(event)
+    
+    if excluded_count:
+        print(f"Skipped {excluded_count} events for excluded services")
+    if missing_description_arns:
+        print(f"Warning: {len(missing_description_arns)} events have no eventDescription: {', '.join(missing_description_arns)}")
     
     # Sort by severity (critical first)
     severity_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
@@ -140,30 +155,20 @@ def prepare_bedrock_payload(events, account_id):
     if not events:
         return None
     
-    # Create summary for Bedrock
+    # Create summary for Bedrock - tallies are stored as plain dicts for the payload
     event_summary = {
         'account_id': account_id,
         'total_events': len(events),
-        'events_by_severity': {},
-        'events_by_service': {},
-        'events_by_category': {},
+        'events_by_severity': dict(Counter(event.get('severity', 'low') for event in events)),
+        'events_by_service': dict(Counter(event.get('service', 'Unknown') for event in events)),
+        'events_by_category': dict(Counter(event.get('eventTypeCategory', 'Unknown') for event in events)),
         'critical_events': [],
         'sample_events': events[:5]  # First 5 events for detailed analysis
     }
     
-    # Count by severity
+    # Collect critical events
     for event in events:
-        severity = event.get('severity', 'low')
-        event_summary['events_by_severity'][severity] = event_summary['events_by_severity'].get(severity, 0) + 1
-        
-        service = event.get('service', 'Unknown')
-        event_summary['events_by_service'][service] = event_summary['events_by_service'].get(service, 0) + 1
-        
-        category = event.get('eventTypeCategory', 'Unknown')
-        event_summary['events_by_category'][category] = event_summary['events_by_category'].get(category, 0) + 1
-        
-        # Collect critical events
-        if severity == 'critical':
+        if event.get('severity', 'low') == 'critical':
             event_summary['critical_events'].append({
                 'arn': event.get('arn', ''),
                 'service': event.get('service', ''),
@@ -267,11 +272,3 @@ RISK LEVEL GUIDELINES:
 Ensure your response is valid JSON that can be parsed programmatically."""
     
     return prompt.strip()
-
-
-def get_excluded_services():
-    """
-    Get list of excluded services from environment
-    """
-    excluded_services_str = os.environ.get('EXCLUDED_SERVICES', '')
-    return [s.strip() for s in excluded_services_str.split(',') if s.strip()]
\ No newline at end of file
@@ -3,14 +3,175 @@ Bedrock Analyzer Lambda Function
 Handles AI analysis of events using Amazon Bedrock with rate limiting
 """
 import boto3
+import hashlib
 import json
 import os
 import re
 import time
 import traceback
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from shared_utils import store_workflow_result
+from shared_utils import AWS_CLIENT_CONFIG, store_workflow_result
+
+# Bedrock model and inference settings, parsed once per container
+BEDROCK_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0')
+BEDROCK_MAX_TOKENS = int(os.environ.get('BEDROCK_MAX_TOKENS', '4000'))
+BEDROCK_TEMPERATURE = float(os.environ.get('BEDROCK_TEMPERATURE', '0.3'))
+BEDROCK_TOP_P = float(os.environ.get('BEDROCK_TOP_P', '0.9'))
+
+# Testing flag that replaces Bedrock calls with placeholder analyses
+TEST_SKIP_BEDROCK = os.environ.get('TEST_SKIP_BEDROCK', 'false').lower() in ('true', '1', 'yes')
+
+# Model inference can take well over the shared client read timeout; retries are
+# left to call_bedrock_with_retry so throttling is not retried at two layers
+BEDROCK_CLIENT_CONFIG = Config(
+    retries={'total_max_attempts': 1, 'mode': 'standard'},
+    connect_timeout=3,
+    read_timeout=120,
+    tcp_keepalive=True
+)
+
+# Bedrock analyses are cached in the workflow results table, one partition per hash of
+# the model settings and prompt; the prefix keeps them apart from real workflow IDs
+ANALYSIS_CACHE_PARTITION_PREFIX = 'BEDROCK_ANALYSIS_CACHE#'
+ANALYSIS_CACHE_SORT_KEY = 'ANALYSIS'
+ANALYSIS_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Free-text fields recovered from malformed responses, and one pattern matching any
+# extractable field so the text is scanned once rather than once per field
+MANUAL_EXTRACTION_TEXT_FIELDS = (
+    'account_impact', 'time_sensitivity', 'risk_category', 'required_actions', 'impact_analysis',
+    'consequences_if_ignored', 'affected_resources', 'business_impact', 'summary'
+)
+MANUAL_EXTRACTION_FIELD_PATTERN = re.compile(
+    r'"(risk_level|key_date|' + '|'.join(MANUAL_EXTRACTION_TEXT_FIELDS) + r')":\s*"([^"]+)"',
+    re.IGNORECASE
+)
+
+# Unquoted boolean "critical" flag, found case-insensitively without lower-casing the text
+CRITICAL_FLAG_PATTERN = re.compile(r'"critical"\s*:\s*(true|false)', re.IGNORECASE)
+
+# Trailing commas before a closing brace/bracket, a common near-miss in model JSON
+TRAILING_COMMA_PATTERN = re.compile(r',\s*([}\]])')
+
+# Upper bound on response text scanned by the parsing regexes
+MAX_RESPONSE_TEXT_LENGTH = 200_000
+
+# Defaults applied to every parsed Bedrock analysis
+ANALYSIS_DEFAULTS = MappingProxyType({
+    'critical': False,
+    'risk_level': 'Low',
+    'account_impact': 'Low',
+    'time_sensitivity': 'Routine',
+    'risk_category': 'Operational',
+    'required_actions': 'Review event details',
+    'impact_analysis': 'Impact assessment pending',
+    'consequences_if_ignored': 'Unknown consequences',
+    'affected_resources': 'Unknown resources',
+    'key_date': None,
+    'business_impact': 'Business impact assessment pending',
+    'summary': 'Analysis summary pending'
+})
+
+# Defaults for fields that could not be extracted from a malformed response
+MANUAL_EXTRACTION_DEFAULTS = MappingProxyType({
+    'account_impact': 'Medium',
+    'time_sensitivity': 'Routine',
+    'risk_category': 'Operational',
+    'required_actions': 'Review event details manually - automated parsing incomplete',
+    'impact_analysis': 'Impact analysis extraction incomplete - manual review required',
+    'consequences_if_ignored': 'Consequences assessment incomplete - manual review required',
+    'affected_resources': 'Resource identification incomplete - manual review required',
+    'business_impact': 'Business impact assessment incomplete - manual review required',
+    'summary': 'Analysis summary extraction incomplete - manual review required'
+})
+
+# Upper-cased model risk levels and their canonical values
+RISK_LEVEL_ALIASES = MappingProxyType({
+    'CRITICAL': 'Critical',
+    'SEVERE': 'Critical',
+    'HIGH': 'High',
+    'MEDIUM': 'Medium',
+    'MODERATE': 'Medium',
+    'LOW': 'Low'
+})
+
+# Fields shared by every analysis returned when Bedrock itself could not be used
+BEDROCK_FAILURE_DEFAULTS = MappingProxyType({
+    'risk_level': 'Medium',
+    'manual_review_required': True,
+    'bedrock_failure': True
+})
+
+
+# Static analysis instructions sent as the system prompt; keeping them out of the
+# per-account message gives every request an identical prefix
+ANALYSIS_SYSTEM_PROMPT = """You are an AWS expert specializing in outage analysis and business continuity. Your task is to analyze these AWS Health events and determine their potential impact on workload availability, system connectivity, and service outages.
+
+IMPORTANT ANALYSIS FOCUS:
+1. Will this event cause workload downtime if required actions are not taken?
+2. Will there be any service outages associated with this event?
+3. Will the application/workload experience network integration issues between connecting systems?
+4. What specific AWS services or resources could be impacted?
+
+CRITICAL EVENT CRITERIA:
+- Any event that will cause service downtime should be marked as CRITICAL
+- Any event that will cause network integration or SSL issues between systems should be marked as CRITICAL
+- Any event that requires immediate action to prevent outage should be marked as URGENT time sensitivity
+- Events with high impact but no immediate downtime should be marked as HIGH risk level
+
+Please analyze these events and provide the following information in JSON format:
+
+{
+    "critical": boolean,
+    "risk_level": "Critical|High|Medium|Low",
+    "account_impact": "Critical|High|Medium|Low",
+    "time_sensitivity": "Critical|Urgent|Routine",
+    "risk_category": "Availability|Security|Performance|Cost|Compliance",
+    "required_actions": "string describing specific actions needed",
+    "impact_analysis": "string describing potential outages and connectivity issues",
+    "consequences_if_ignored": "string describing what outages will occur if not addressed",
+    "affected_resources": "string listing specific resources that could be impacted",
+    "key_date": "YYYY-MM-DD or null",
+    "business_impact": "assessment of business impact including potential downtime",
+    "summary": "brief executive summary focusing on outage risk"
+}
+
+IMPORTANT: In your impact_analysis field, be very specific about:
+1. Potential outages and their estimated duration
+2. Connectivity issues between systems
+3. Whether this will cause downtime if actions are not taken
+
+In your consequences_if_ignored field, clearly state what outages or disruptions will occur if the event is not addressed.
+
+For the key_date field:
+- Analyze the event description for any dates that customers need to be aware of
+- Look for dates when actions must be taken, when changes will occur, or when impacts will begin
+- Return the EARLIEST date that will impact the customer in YYYY-MM-DD format
+- If no specific date is mentioned or can be determined, return null
+- Common date patterns to look for: deadlines, maintenance windows, deprecation dates, end-of-life dates, migration deadlines
+
+RISK LEVEL GUIDELINES:
+- CRITICAL: Will cause service outage or severe disruption if not addressed
+- HIGH: Significant impact but not an immediate outage
+- MEDIUM: Moderate impact requiring attention
+- LOW: Minimal impact, routine maintenance
+
+Ensure your response is valid JSON that can be parsed programmatically."""
+
+# Request fields that are identical for every invocation, including the long system
+# prompt, serialized once; only the per-account message is serialized per request
+BEDROCK_REQUEST_ENVELOPE_JSON = json.dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": BEDROCK_MAX_TOKENS,
+    "temperature": BEDROCK_TEMPERATURE,
+    "top_p": BEDROCK_TOP_P,
+    "system": ANALYSIS_SYSTEM_PROMPT
+})
 
 
 def lambda_handler(event, context):
@@ -39,8 +200,14 @@ def lambda_handler(event, context):
                 analysis_result['retry_count'] = retry_count
                 analysis_result['failure_reason'] = 'Exceeded maximum retry attempts'
             else:
+                # Cache hits never call Bedrock, so they are served without taking a rate limit token
+                cached_analysis = get_cached_message_analysis(message)
+                if cached_analysis:
+                    analysis_result = cached_analysis
+                    analysis_result['bedrock_failure'] = False
+                    analysis_result['retry_count'] = retry_count
                 # Check rate limit before processing
-                if not check_bedrock_rate_limit():
+                elif not check_bedrock_rate_limit():
                     print(f"Rate limit exceeded - message will be retried (attempt {retry_count + 1})")
                     # Only retry if we haven't exceeded max attempts
                     if retry_count < max_retries - 1:
@@ -158,8 +325,8 @@ def lambda_handler(event, context):
                     successful_messages.append(record['receiptHandle'])
                     print(f"Marked message as processed to prevent infinite retry")
         except Exception as e:
-            print(f"Error processing message: {str(e)}")
-            traceback.print_exc()
+            # One write per failed record - print_exc writes the traceback line by line
+            print(f"Error processing message: {str(e)}\n{traceback.format_exc()}")
             
             # Try to create placeholder analysis for unexpected errors
             try:
@@ -213,7 +380,7 @@ def check_bedrock_rate_limit():
             print("No rate limiter table configured, allowing call")
             return True
         
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
         table = dynamodb.Table(table_name)
         
         response = table.get_item(Key={'limiter_id': 'bedrock_calls'})
@@ -267,7 +434,7 @@ def update_rate_limit_backoff():
         if not table_name:
             return
         
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
         table = dynamodb.Table(table_name)
         
         # Reduce max calls per minute
@@ -337,8 +504,7 @@ def create_placeholder_analysis(message):
         risk_justification = "No health events found for this account"
     
     # Check if this is test mode
-    test_skip_bedrock = os.environ.get('TEST_SKIP_BEDROCK', 'false').lower()
-    is_test_mode = test_skip_bedrock in ['true', '1', 'yes']
+    is_test_mode = TEST_SKIP_BEDROCK
     
     # Create comprehensive placeholder analysis
     placeholder_analysis = {
@@ -381,8 +547,7 @@ def analyze_with_bedrock(message):
     Analyze events using Amazon Bedrock with enhanced outage-focused analysis
     """
     # Check for testing flag to skip Bedrock calls
-    test_skip_bedrock = os.environ.get('TEST_SKIP_BEDROCK', 'false').lower()
-    if test_skip_bedrock in ['true', '1', 'yes']:
+    if TEST_SKIP_BEDROCK:
         print("TEST_SKIP_BEDROCK is enabled - using placeholder analysis instead of Bedrock")
         placeholder_analysis = create_placeholder_analysis(message)
         placeholder_analysis['test_mode'] = True
@@ -399,18 +564,130 @@ def analyze_with_bedrock(message):
     
     # Get processed events for detailed analysis
     processed_events = message.get('processed_events', [])
-    account_id = message.get('account_id', 'unknown')
     
     # Create enhanced prompt with outage focus
-    prompt = create_enhanced_analysis_prompt(processed_events, account_id)
+    prompt = create_enhanced_analysis_prompt(processed_events)
+    
+    # The cache was already checked by get_cached_message_analysis before this call
+    cache_key = create_analysis_cache_key(prompt)
     
     # Call Bedrock with retry and enhanced response parsing
-    return call_bedrock_with_retry(prompt)
+    analysis_result = call_bedrock_with_retry(prompt)
+    
+    if is_cacheable_analysis(analysis_result):
+        store_cached_analysis(cache_key, analysis_result)
+    
+    return analysis_result
 
 
-def create_enhanced_analysis_prompt(processed_events, account_id):
+def is_cacheable_analysis(analysis):
+    """
+    Check whether an analysis came from a cleanly parsed Bedrock response
+    
+    Failures, empty replies and parsing fallbacks should be retried on the next
+    request rather than reused for every account with the same events.
+    """
+    return (
+        bool(analysis.get('analysis_text'))
+        and not analysis.get('bedrock_failure')
+        and 'error' not in analysis
+        and not analysis.get('parsing_error')
+        and not analysis.get('manual_extraction')
+        and not analysis.get('manual_review_required')
+    )
+
+
+def get_cached_message_analysis(message):
+    """
+    Get a cached Bedrock analysis for the message's events, or None on a miss
+    
+    Accounts affected by the same events produce the same prompt, so they can
+    reuse one analysis.
+    """
+    if TEST_SKIP_BEDROCK or not message.get('bedrock_payload'):
+        return None
+    
+    prompt = create_enhanced_analysis_prompt(message.get('processed_events', []))
+    cache_key = create_analysis_cache_key(prompt)
+    cached_analysis = get_cached_analysis(cache_key)
+    if cached_analysis:
+        print(f"Using cached Bedrock analysis {cache_key[:12]}")
+    
+    return cached_analysis
+
+
+def create_analysis_cache_key(prompt):
+    """
+    Hash everything that determines a Bedrock analysis into a cache key
+    """
+    cache_input = '|'.join([
+        BEDROCK_MODEL_ID, str(BEDROCK_MAX_TOKENS), str(BEDROCK_TEMPERATURE), str(BEDROCK_TOP_P),
+        ANALYSIS_SYSTEM_PROMPT, prompt
+    ])
+    return hashlib.sha256(cache_input.encode('utf-8')).hexdigest()
+
+
+def get_cached_analysis(cache_key):
+    """
+    Get a previously stored Bedrock analysis, or None on a miss or error
+    """
+    try:
+        table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
+        if not table_name:
+            return None
+        
+        dynamodb_client = boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
+        response = dynamodb_client.get_item(
+            TableName=table_name,
+            Key={
+                'workflow_id': {'S': f"{ANALYSIS_CACHE_PARTITION_PREFIX}{cache_key}"},
+                'account_id': {'S': ANALYSIS_CACHE_SORT_KEY}
+            },
+            ProjectionExpression='analysis_json, #ttl',
+            ExpressionAttributeNames={'#ttl': 'ttl'}
+        )
+        
+        item = response.get('Item')
+        # TTL deletion is lazy, so expired items can still be returned
+        if not item or int(item['ttl']['N']) < time.time():
+            return None
+        
+        return json.loads(item['analysis_json']['S'])
+        
+    except Exception as e:
+        print(f"Analysis cache lookup failed: {e}")
+        return None
+
+
+def store_cached_analysis(cache_key, analysis):
+    """
+    Store a Bedrock analysis for reuse by identical prompts
+    """
+    try:
+        table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
+        if not table_name:
+            return
+        
+        dynamodb_client = boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
+        dynamodb_client.put_item(
+            TableName=table_name,
+            Item={
+                'workflow_id': {'S': f"{ANALYSIS_CACHE_PARTITION_PREFIX}{cache_key}"},
+                'account_id': {'S': ANALYSIS_CACHE_SORT_KEY},
+                'analysis_json': {'S': json.dumps(analysis, default=str)},
+                'ttl': {'N': str(int(time.time()) + ANALYSIS_CACHE_TTL_SECONDS)}
+            }
+        )
+        
+    except Exception as e:
+        print(f"Failed to cache analysis: {e}")
+
+
+def create_enhanced_analysis_prompt(processed_events):
     """
     Create enhanced prompt focused on outage analysis and business continuity
+    
+    The prompt depends only on the events, so it doubles as the analysis cache key.
     """
     if not processed_events:
         return "No events to analyze for this account."
@@ -430,20 +707,19 @@ def create_enhanced_analysis_prompt(processed_events, account_id):
     if hasattr(start_time, 'isoformat'):
         start_time = start_time.isoformat()
     
-    # Create event summary
+    # Create event summary - severities are tallied in a single pass
+    severity_counts = Counter(e.get('severity') for e in processed_events)
     event_summary = {
         'total_events': len(processed_events),
-        'critical_events': len([e for e in processed_events if e.get('severity') == 'critical']),
-        'high_events': len([e for e in processed_events if e.get('severity') == 'high']),
-        'services_affected': list(set([e.get('service', 'Unknown') for e in processed_events])),
-        'regions_affected': list(set([e.get('region', 'Unknown') for e in processed_events]))
+        'critical_events': severity_counts['critical'],
+        'high_events': severity_counts['high'],
+        # Sorted so the prompt, and with it the cache key, is the same in every container
+        'services_affected': sorted({e.get('service', 'Unknown') for e in processed_events}),
+        'regions_affected': sorted({e.get('region', 'Unknown') for e in processed_events})
     }
     
-    prompt = f"""You are an AWS expert specializing in outage analysis and business continuity. Your task is to analyze these AWS Health events and determine their potential impact on workload availability, system connectivity, and service outages.
-
-ACCOUNT: {account_id}
-
-PRIMARY EVENT ANALYSIS:
+    # The account ID is deliberately left out so accounts with the same events share a prompt
+    prompt = f"""PRIMARY EVENT ANALYSIS:
 - Type: {event_type}
 - Category: {event_category}
 - Region: {region}
@@ -457,95 +733,47 @@ ACCOUNT SUMMARY:
 - Critical Events: {event_summary['critical_events']}
 - High Priority Events: {event_summary['high_events']}
 - Affected Services: {', '.join(event_summary['services_affected'])}
-- Affected Regions: {', '.join(event_summary['regions_affected'])}
-
-IMPORTANT ANALYSIS FOCUS:
-1. Will this event cause workload downtime if required actions are not taken?
-2. Will there be any service outages associated with this event?
-3. Will the application/workload experience network integration issues between connecting systems?
-4. What specific AWS services or resources could be impacted?
-
-CRITICAL EVENT CRITERIA:
-- Any event that will cause service downtime should be marked as CRITICAL
-- Any event that will cause network integration or SSL issues between systems should be marked as CRITICAL
-- Any event that requires immediate action to prevent outage should be marked as URGENT time sensitivity
-- Events with high impact but no immediate downtime should be marked as HIGH risk level
-
-Please analyze these events and provide the following information in JSON format:
-
-{{
-    "critical": boolean,
-    "risk_level": "Critical|High|Medium|Low",
-    "account_impact": "Critical|High|Medium|Low",
-    "time_sensitivity": "Critical|Urgent|Routine",
-    "risk_category": "Availability|Security|Performance|Cost|Compliance",
-    "required_actions": "string describing specific actions needed",
-    "impact_analysis": "string describing potential outages and connectivity issues",
-    "consequences_if_ignored": "string describing what outages will occur if not addressed",
-    "affected_resources": "string listing specific resources that could be impacted",
-    "key_date": "YYYY-MM-DD or null",
-    "business_impact": "assessment of business impact including potential downtime",
-    "summary": "brief executive summary focusing on outage risk"
-}}
-
-IMPORTANT: In your impact_analysis field, be very specific about:
-1. Potential outages and their estimated duration
-2. Connectivity issues between systems
-3. Whether this will cause downtime if actions are not taken
+- Affected Regions: {', '.join(event_summary['regions_affected'])}"""
+    
+    return prompt
 
-In your consequences_if_ignored field, clearly state what outages or disruptions will occur if the event is not addressed.
 
-For the key_date field:
-- Analyze the event description for any dates that customers need to be aware of
-- Look for dates when actions must be taken, when changes will occur, or when impacts will begin
-- Return the EARLIEST date that will impact the customer in YYYY-MM-DD format
-- If no specific date is mentioned or can be determined, return null
-- Common date patterns to look for: deadlines, maintenance windows, deprecation dates, end-of-life dates, migration deadlines
+@lru_cache(maxsize=1)
+def get_bedrock_runtime_client():
+    """
+    Get the Bedrock runtime client, created once per Lambda container
+    """
+    return boto3.client('bedrock-runtime', config=BEDROCK_CLIENT_CONFIG)
 
-RISK LEVEL GUIDELINES:
-- CRITICAL: Will cause service outage or severe disruption if not addressed
-- HIGH: Significant impact but not an immediate outage
-- MEDIUM: Moderate impact requiring attention
-- LOW: Minimal impact, routine maintenance
 
-Ensure your response is valid JSON that can be parsed programmatically."""
+def create_bedrock_request_body(prompt):
+    """
+    Serialize the InvokeModel request body for a user prompt
     
-    return prompt
+    The pre-serialized envelope object is reopened and the messages list appended,
+    which yields the same JSON as serializing the whole request dict.
+    """
+    messages_json = json.dumps([{"role": "user", "content": prompt}])
+    return f'{BEDROCK_REQUEST_ENVELOPE_JSON[:-1]}, "messages": {messages_json}}}'
 
 
 def call_bedrock_with_retry(prompt, max_retries=3):
     """
     Call Bedrock with exponential backoff retry
     """
-    bedrock = boto3.client('bedrock-runtime')
+    bedrock = get_bedrock_runtime_client()
     
-    model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0')
-    max_tokens = int(os.environ.get('BEDROCK_MAX_TOKENS', '4000'))
-    temperature = float(os.environ.get('BEDROCK_TEMPERATURE', '0.3'))
-    top_p = float(os.environ.get('BEDROCK_TOP_P', '0.9'))
+    # Prepare and serialize the request body once - it is identical on every attempt
+    request_body = create_bedrock_request_body(prompt)
     
     for attempt in range(max_retries):
         try:
             print(f"Calling Bedrock (attempt {attempt + 1}/{max_retries})")
             
-            # Prepare request body
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "top_p": top_p,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
-            
             # Call Bedrock
             response = bedrock.invoke_model(
-                modelId=model_id,
-                body=json.dumps(request_body)
+                modelId=BEDROCK_MODEL_ID,
+                body=request_body
             )
             
             # Parse response
@@ -590,23 +818,19 @@ def call_bedrock_with_retry(prompt, max_retries=3):
                 else:
                     print("Final attempt failed due to throttling")
                     return {
-                        'risk_level': 'Medium',
+                        **BEDROCK_FAILURE_DEFAULTS,
                         'risk_justification': 'Analysis failed due to persistent Bedrock throttling',
                         'summary': 'Unable to complete Bedrock analysis due to throttling after multiple attempts',
                         'error': 'Bedrock throttling',
-                        'manual_review_required': True,
-                        'bedrock_failure': True,
                         'failure_reason': 'Persistent Bedrock throttling after multiple retry attempts'
                     }
             else:
                 print(f"Bedrock error: {error_code} - {e.response['Error']['Message']}")
                 return {
-                    'risk_level': 'Medium',
+                    **BEDROCK_FAILURE_DEFAULTS,
                     'risk_justification': f'Analysis failed due to Bedrock error: {error_code}',
                     'summary': f'Unable to complete Bedrock analysis due to {error_code}',
                     'error': f'Bedrock error: {error_code}',
-                    'manual_review_required': True,
-                    'bedrock_failure': True,
                     'failure_reason': f'Bedrock service error: {error_code} - {e.response["Error"]["Message"]}'
                 }
         except Exception as e:
@@ -618,23 +842,19 @@ def call_bedrock_with_retry(prompt, max_retries=3):
                 continue
             else:
                 return {
-                    'risk_level': 'Medium',
+                    **BEDROCK_FAILURE_DEFAULTS,
                     'risk_justification': f'Analysis failed due to unexpected error: {str(e)}',
                     'summary': 'Unable to complete Bedrock analysis due to unexpected error',
                     'error': f'Unexpected error: {str(e)}',
-                    'manual_review_required': True,
-                    'bedrock_failure': True,
                     'failure_reason': f'Unexpected error during Bedrock analysis: {str(e)}'
                 }
     
     # If we get here, all retries failed
     return {
-        'risk_level': 'Medium',
+        **BEDROCK_FAILURE_DEFAULTS,
         'risk_justification': 'Analysis failed due to repeated Bedrock errors',
         'summary': 'Unable to complete Bedrock analysis after multiple attempts',
         'error': 'Bedrock analysis failed',
-        'manual_review_required': True,
-        'bedrock_failure': True,
         'failure_reason': 'Bedrock analysis failed after multiple retry attempts'
     }
 
@@ -642,26 +862,37 @@ def call_bedrock_with_retry(prompt, max_retries=3):
 def parse_bedrock_response(response_text):
     """
     Enhanced parsing of Bedrock response with multiple extraction methods
+    
+    Returns None for a blank response, which has nothing to parse or extract.
     """
-    import re
+    if not response_text or response_text.isspace():
+        return None
+    
+    # Bound regex work on runaway model output
+    response_text = response_text[:MAX_RESPONSE_TEXT_LENGTH]
     
     # Method 1: Try to extract JSON from code blocks
-    json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        # Method 2: Look for JSON object in the response
-        json_match = re.search(r'({.*})', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
+    json_str = extract_json_code_block(response_text)
+    if json_str is None:
+        # Method 2: Look for JSON object in the response - the outermost braces,
+        # found with two linear scans instead of a backtracking regex
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start != -1 and end > start:
+            json_str = response_text[start:end + 1]
         else:
             json_str = response_text
     
+    # Plain-text or truncated responses cannot be a complete JSON object - checking
+    # the first and last characters is enough to skip the doomed parse attempt
+    stripped_json = json_str.strip()
+    if stripped_json[:1] != '{' or stripped_json[-1:] != '}':
+        print("No complete JSON object found in response, attempting manual field extraction...")
+        return extract_fields_manually(response_text)
+    
     # Try to parse the JSON
     try:
-        # Clean the JSON string to handle control characters
-        cleaned_json = json_str.replace('\n', '\\n').replace('\t', '\\t').replace('\r', '\\r')
-        analysis = json.loads(cleaned_json)
+        analysis = parse_lenient_json(json_str)
         
         # Normalize and validate the response
         analysis = normalize_analysis_response(analysis)
@@ -675,56 +906,79 @@ def parse_bedrock_response(response_text):
         return extract_fields_manually(response_text)
 
 
+def parse_lenient_json(json_str):
+    """
+    Parse near-valid JSON as emitted by the model
+    
+    strict=False accepts raw control characters (such as newlines) inside strings,
+    which the model often emits in long text fields. If that still fails, trailing
+    commas before a closing brace or bracket are removed and the parse is retried.
+    
+    Raises:
+        json.JSONDecodeError: If the text cannot be parsed either way
+    """
+    try:
+        return json.loads(json_str, strict=False)
+    except json.JSONDecodeError:
+        return json.loads(TRAILING_COMMA_PATTERN.sub(r'\1', json_str), strict=False)
+
+
+def extract_json_code_block(response_text):
+    """
+    Return the contents of the first ```json fenced block, or None if absent
+    """
+    start = response_text.find('```json')
+    if start == -1:
+        return None
+    
+    start += len('```json')
+    end = response_text.find('```', start)
+    if end == -1:
+        return None
+    
+    return response_text[start:end].strip()
+
+
+def normalize_risk_level(raw_risk_level):
+    """
+    Map a model-provided risk level onto the canonical values
+    
+    Returns None for unrecognized values so the caller can keep the original.
+    """
+    return RISK_LEVEL_ALIASES.get(raw_risk_level.strip().upper())
+
+
+@lru_cache(maxsize=64)
+def normalize_time_sensitivity(raw_time_sensitivity):
+    """
+    Map a model-provided time sensitivity onto Critical, Urgent or Routine
+    """
+    time_sens = raw_time_sensitivity.strip().title()
+    if time_sens not in ['Critical', 'Urgent', 'Routine']:
+        return 'Routine'
+    return time_sens
+
+
 def normalize_analysis_response(analysis):
     """
     Normalize and validate the analysis response
     """
-    # Ensure required fields exist with defaults
-    defaults = {
-        'critical': False,
-        'risk_level': 'Low',
-        'account_impact': 'Low',
-        'time_sensitivity': 'Routine',
-        'risk_category': 'Operational',
-        'required_actions': 'Review event details',
-        'impact_analysis': 'Impact assessment pending',
-        'consequences_if_ignored': 'Unknown consequences',
-        'affected_resources': 'Unknown resources',
-        'key_date': None,
-        'business_impact': 'Business impact assessment pending',
-        'summary': 'Analysis summary pending'
-    }
-    
-    # Apply defaults for missing fields
-    for key, default_value in defaults.items():
-        if key not in analysis:
-            analysis[key] = default_value
+    # Apply defaults for missing fields - one C-level merge instead of a setdefault per field
+    analysis = {**ANALYSIS_DEFAULTS, **analysis}
     
     # Normalize risk level to ensure consistency
-    if 'risk_level' in analysis:
-        risk_level = str(analysis['risk_level']).strip().upper()
-        
-        if risk_level in ['CRITICAL', 'SEVERE']:
-            analysis['risk_level'] = 'Critical'
+    risk_level = normalize_risk_level(str(analysis['risk_level']))
+    if risk_level:
+        analysis['risk_level'] = risk_level
+        if risk_level == 'Critical':
             analysis['critical'] = True
-        elif risk_level == 'HIGH':
-            analysis['risk_level'] = 'High'
-        elif risk_level in ['MEDIUM', 'MODERATE']:
-            analysis['risk_level'] = 'Medium'
-        elif risk_level == 'LOW':
-            analysis['risk_level'] = 'Low'
     
     # Ensure critical flag is consistent with risk level
     if analysis.get('critical', False) and analysis['risk_level'] != 'Critical':
         analysis['risk_level'] = 'Critical'
     
     # Normalize time sensitivity
-    if 'time_sensitivity' in analysis:
-        time_sens = str(analysis['time_sensitivity']).strip().title()
-        if time_sens not in ['Critical', 'Urgent', 'Routine']:
-            analysis['time_sensitivity'] = 'Routine'
-        else:
-            analysis['time_sensitivity'] = time_sens
+    analysis['time_sensitivity'] = normalize_time_sensitivity(str(analysis['time_sensitivity']))
     
     return analysis
 
@@ -733,72 +987,45 @@ def extract_fields_manually(response_text):
     """
     Manually extract fields from response text when JSON parsing fails
     """
-    import re
+    # Bound regex work on runaway model output
+    response_text = response_text[:MAX_RESPONSE_TEXT_LENGTH]
     
     manual_analysis = {}
     
-    # Extract critical status
-    if '"critical": false' in response_text.lower() or '"critical":false' in response_text.lower():
-        manual_analysis['critical'] = False
-    elif '"critical": true' in response_text.lower() or '"critical":true' in response_text.lower():
-        manual_analysis['critical'] = True
-    else:
-        manual_analysis['critical'] = False
+    # Extract critical status - any "critical": false takes precedence over true
+    critical_flags = {flag.lower() for flag in CRITICAL_FLAG_PATTERN.findall(response_text)}
+    manual_analysis['critical'] = 'true' in critical_flags and 'false' not in critical_flags
+    
+    # Collect the first value of every known field in a single pass over the text
+    extracted_fields = {}
+    for match in MANUAL_EXTRACTION_FIELD_PATTERN.finditer(response_text):
+        extracted_fields.setdefault(match.group(1).lower(), match.group(2))
     
     # Extract risk level
-    risk_match = re.search(r'"risk_level":\s*"([^"]+)"', response_text, re.IGNORECASE)
-    if risk_match:
-        manual_analysis['risk_level'] = risk_match.group(1).title()
+    if 'risk_level' in extracted_fields:
+        manual_analysis['risk_level'] = extracted_fields['risk_level'].title()
     else:
         manual_analysis['risk_level'] = 'Medium'
     
     # Extract other key fields
-    field_patterns = {
-        'account_impact': r'"account_impact":\s*"([^"]+)"',
-        'time_sensitivity': r'"time_sensitivity":\s*"([^"]+)"',
-        'risk_category': r'"risk_category":\s*"([^"]+)"',
-        'required_actions': r'"required_actions":\s*"([^"]+)"',
-        'impact_analysis': r'"impact_analysis":\s*"([^"]+)"',
-        'consequences_if_ignored': r'"consequences_if_ignored":\s*"([^"]+)"',
-        'affected_resources': r'"affected_resources":\s*"([^"]+)"',
-        'business_impact': r'"business_impact":\s*"([^"]+)"',
-        'summary': r'"summary":\s*"([^"]+)"'
-    }
-    
-    for field, pattern in field_patterns.items():
-        match = re.search(pattern, response_text, re.IGNORECASE | re.DOTALL)
-        if match:
+    for field in MANUAL_EXTRACTION_TEXT_FIELDS:
+        if field in extracted_fields:
             # Clean up the extracted text
-            value = match.group(1).replace('\\n', '\n').replace('\\t', '\t')
+            value = extracted_fields[field].replace('\\n', '\n').replace('\\t', '\t')
             manual_analysis[field] = value[:500]  # Limit length
     
     # Extract key_date
-    date_match = re.search(r'"key_date":\s*"([^"]+)"', response_text, re.IGNORECASE)
-    if date_match:
-        date_value = date_match.group(1)
+    date_value = extracted_fields.get('key_date')
+    if date_value:
         manual_analysis['key_date'] = date_value if date_value.lower() != 'null' else None
     else:
         manual_analysis['key_date'] = None
     
-    # Apply defaults for missing fields
-    defaults = {
-        'account_impact': 'Medium',
-        'time_sensitivity': 'Routine',
-        'risk_category': 'Operational',
-        'required_actions': 'Review event details manually - automated parsing incomplete',
-        'impact_analysis': 'Impact analysis extraction incomplete - manual review required',
-        'consequences_if_ignored': 'Consequences assessment incomplete - manual review required',
-        'affected_resources': 'Resource identification incomplete - manual review required',
-        'business_impact': 'Business impact assessment incomplete - manual review required',
-        'summary': 'Analysis summary extraction incomplete - manual review required'
-    }
-    
-    for key, default_value in defaults.items():
-        if key not in manual_analysis:
-            manual_analysis[key] = default_value
+    # Regex-recovered fields are best effort, so mark the result as degraded
+    manual_analysis['manual_extraction'] = True
     
-    # Normalize the manually extracted analysis
-    return normalize_analysis_response(manual_analysis)
+    # Apply defaults for missing fields and normalize the manually extracted analysis
+    return normalize_analysis_response({**MANUAL_EXTRACTION_DEFAULTS, **manual_analysis})
 
 
 def create_fallback_analysis(response_text):
@@ -3,12 +3,20 @@ Email Queue Manager and Workflow Cleanup Lambda Function
 Combined completion checker, email queue manager, and workflow cleanup
 """
 import boto3
+import hashlib
 import json
 import os
 import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
-from shared_utils import IncompleteWorkflowException, get_workflow_results, cleanup_workflow_results
+from shared_utils import AWS_CLIENT_CONFIG, IncompleteWorkflowException, get_workflow_results, cleanup_workflow_results
+
+# SQS rejects messages over 256 KB; larger bodies are offloaded to S3
+SQS_MESSAGE_SIZE_THRESHOLD = 200 * 1024
+
+# Concurrent account-specific email queue sends
+EMAIL_QUEUE_MAX_WORKERS = 8
 
 
 def lambda_handler(event, context):
@@ -109,7 +117,10 @@ def queue_email_notifications(workflow_id, all_results):
             'workflow_id': workflow_id
         }
     
-    sqs = boto3.client('sqs')
+    sqs = boto3.client('sqs', config=AWS_CLIENT_CONFIG)
+    # Shared by all sends for large-body offload; clients are thread-safe, but creating
+    # them from the default session is not
+    s3_client = boto3.client('s3', config=AWS_CLIENT_CONFIG)
     email_queue_url = os.environ['EMAIL_NOTIFICATION_QUEUE_URL']
     
     # Group results by email address
@@ -123,38 +134,13 @@ def queue_email_notifications(workflow_id, all_results):
     if test_master_only:
         print("TEST_MASTER_EMAIL_ONLY enabled - skipping account-specific emails")
     else:
-        for email_address, account_results in emails_to_send.items():
-            try:
-                message_body = {
-                    'email_type': 'account_specific',
-                    'email_address': email_address,
-                    'workflow_id': workflow_id,
-                    'account_results': account_results,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Create a more robust deduplication ID that includes content hash
-                import hashlib
-                content_hash = hashlib.md5(json.dumps(sorted([r.get('account_id') for r in account_results]), default=str).encode()).hexdigest()[:8]
-                dedup_id = f"{workflow_id}-{email_address}-{content_hash}-account"
-                
-                response = sqs.send_message(
-                    QueueUrl=email_queue_url,
-                    MessageBody=json.dumps(message_body, default=str),
-                    MessageGroupId=f"account-{email_address}",
-                    MessageDeduplicationId=dedup_id
-                )
-                
-                queued_emails.append({
-                    'email': email_address,
-                    'accounts': len(account_results),
-                    'message_id': response['MessageId'],
-                    'type': 'account_specific'
-                })
-                print(f"Queued account-specific email for {email_address} ({len(account_results)} accounts)")
-                
-            except Exception as e:
-                print(f"Failed to queue email for {email_address}: {e}")
+        # Each email address has its own message group, so sends are independent
+        with ThreadPoolExecutor(max_workers=EMAIL_QUEUE_MAX_WORKERS) as executor:
+            queued = executor.map(
+                lambda item: queue_account_email(sqs, s3_client, email_queue_url, workflow_id, *item),
+                emails_to_send.items()
+            )
+            queued_emails.extend(q for q in queued if q)
     
     # Queue master report email
     try:
@@ -171,13 +157,12 @@ def queue_email_notifications(workflow_id, all_results):
             }
             
             # Create a more robust deduplication ID for master report
-            import hashlib
-            content_hash = hashlib.md5(json.dumps(sorted([r.get('account_id') for r in all_results]), default=str).encode()).hexdigest()[:8]
+            content_hash = create_accounts_hash(all_results)
             dedup_id = f"{workflow_id}-{content_hash}-master-report"
             
             response = sqs.send_message(
                 QueueUrl=email_queue_url,
-                MessageBody=json.dumps(message_body, default=str),
+                MessageBody=offload_large_message_body(serialize_message_body(message_body), workflow_id, s3_client),
                 MessageGroupId="master-report",
                 MessageDeduplicationId=dedup_id
             )
@@ -209,27 +194,106 @@ def queue_email_notifications(workflow_id, all_results):
     }
 
 
+def queue_account_email(sqs, s3_client, email_queue_url, workflow_id, email_address, account_results):
+    """
+    Queue one account-specific email notification
+    
+    Returns:
+        dict: Queued email summary, or None if queuing failed
+    """
+    try:
+        message_body = {
+            'email_type': 'account_specific',
+            'email_address': email_address,
+            'workflow_id': workflow_id,
+            'account_results': account_results,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Create a more robust deduplication ID that includes content hash
+        content_hash = create_accounts_hash(account_results)
+        dedup_id = f"{workflow_id}-{email_address}-{content_hash}-account"
+        
+        response = sqs.send_message(
+            QueueUrl=email_queue_url,
+            MessageBody=offload_large_message_body(serialize_message_body(message_body), workflow_id, s3_client),
+            MessageGroupId=f"account-{email_address}",
+            MessageDeduplicationId=dedup_id
+        )
+        
+        print(f"Queued account-specific email for {email_address} ({len(account_results)} accounts)")
+        return {
+            'email': email_address,
+            'accounts': len(account_results),
+            'message_id': response['MessageId'],
+            'type': 'account_specific'
+        }
+        
+    except Exception as e:
+        print(f"Failed to queue email for {email_address}: {e}")
+        return None
+
+
+def serialize_message_body(message_body):
+    """
+    Serialize an SQS message body once, in compact form
+    
+    DynamoDB results carry Decimal values, so non-JSON types fall back to str.
+    """
+    return json.dumps(message_body, default=str, separators=(',', ':'))
+
+
+def offload_large_message_body(body, workflow_id, s3_client):
+    """
+    Store message bodies that would exceed the SQS size limit in S3
+    
+    Returns the body unchanged when it fits, otherwise a small pointer message
+    that the email sender resolves before processing.
+    """
+    # Encoded once - the same bytes are measured and uploaded
+    body_bytes = body.encode('utf-8')
+    if len(body_bytes) < SQS_MESSAGE_SIZE_THRESHOLD:
+        return body
+    
+    bucket_name = os.environ.get('REPORTS_BUCKET')
+    if not bucket_name:
+        print("Warning: Message body exceeds SQS size threshold but REPORTS_BUCKET is not configured")
+        return body
+    
+    key = f"email-payloads/{workflow_id}/{uuid.uuid4()}.json"
+    s3_client.put_object(Bucket=bucket_name, Key=key, Body=body_bytes, ContentType='application/json')
+    print(f"Offloaded {len(body_bytes)} byte message body to s3://{bucket_name}/{key}")
+    
+    return serialize_message_body({'s3_pointer': f"s3://{bucket_name}/{key}"})
+
+
+def create_accounts_hash(results):
+    """
+    Create a short content hash from the account IDs in a list of results
+    """
+    account_ids = sorted(str(r.get('account_id')) for r in results)
+    return hashlib.md5(','.join(account_ids).encode()).hexdigest()[:8]
+
+
 def group_results_by_email(all_results):
     """
     Group analysis results by email address
     """
-    email_groups = defaultdict(list)
-    
+    email_groups = {}
+    unmapped_count = 0
+
     for result in all_results:
-        result_data = result.get('result_data', {})
-        email_mapping = result_data.get('email_mapping')
-        
+        email_mapping = (result.get('result_data') or {}).get('email_mapping')
+
         if email_mapping:
-            email_groups[email_mapping].append(result)
+            email_groups.setdefault(email_mapping, []).append(result)
         else:
-            print(f"No email mapping for account {result.get('account_id', 'unknown')}")
-    
-    print(f"Grouped results into {len(email_groups)} email addresses")
-    for email, results in email_groups.items():
-        accounts = [r.get('account_id', 'unknown') for r in results]
-        print(f"Email {email}: accounts {accounts}")
-    
-    return dict(email_groups)
+            unmapped_count += 1
+
+    print(f"Grouped {len(all_results)} results into {len(email_groups)} email addresses "
+          f"({unmapped_count} without email mapping)")
+
+    return email_groups
 
 
 def check_emails_already_queued(workflow_id):
@@ -237,16 +301,18 @@ def check_emails_already_queued(workflow_id):
     Check if emails were already queued for this workflow using DynamoDB
     """
     try:
-        dynamodb = boto3.resource('dynamodb')
+        # Existence check only - the low-level client avoids Resource deserialization
+        dynamodb_client = boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
         table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
-        table = dynamodb.Table(table_name)
         
         # Check for a special marker item indicating emails were queued
-        response = table.get_item(
+        response = dynamodb_client.get_item(
+            TableName=table_name,
             Key={
-                'workflow_id': workflow_id,
-                'account_id': 'EMAIL_QUEUED_MARKER'
-            }
+                'workflow_id': {'S': workflow_id},
+                'account_id': {'S': 'EMAIL_QUEUED_MARKER'}
+            },
+            ProjectionExpression='workflow_id'
         )
         
         return 'Item' in response
@@ -263,7 +329,7 @@ def mark_emails_as_queued(workflow_id):
     try:
         import time
         from botocore.exceptions import ClientError
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
         table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
         table = dynamodb.Table(table_name)
         
@@ -5,6 +5,7 @@ Sends individual emails from SQS queue with Excel reports
 import boto3
 import json
 import os
+import time
 import traceback
 from datetime import datetime
 from io import BytesIO
@@ -12,10 +13,58 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 import base64
+import re
+from collections import Counter
+from functools import lru_cache
+from botocore.exceptions import ClientError
 
 # Import Excel generation functions from the original code
 # We'll need to extract these functions or recreate them
-from shared_utils import get_workflow_results
+from shared_utils import AWS_CLIENT_CONFIG, get_workflow_results
+
+# SES account mode rarely changes, so warm Lambda containers reuse it briefly
+SES_MODE_CACHE_TTL_SECONDS = 300
+_ses_sandbox_cache = {'value': None, 'timestamp': 0}
+
+# Recipient verification status is cached the same way: email -> (status, timestamp)
+SES_VERIFICATION_CACHE_TTL_SECONDS = 300
+_ses_verification_cache = {}
+
+# get_identity_verification_attributes accepts at most this many identities per call
+SES_VERIFICATION_BATCH_SIZE = 100
+
+# Report branding used in subjects and email bodies
+CUSTOMER_NAME = os.environ.get('CUSTOMER_NAME', 'AWS Health Events')
+
+# Summary values used when neither the event nor the Bedrock analysis provides one
+ANALYSIS_SUMMARY_DEFAULTS = {
+    'risk_level': 'Low',
+    'risk_category': 'Operational',
+    'time_sensitivity': 'Routine'
+}
+
+# Readable descriptions of the mapping source codes from get_combined_account_email_mapping
+MAPPING_SOURCE_DESCRIPTIONS = {
+    'custom': 'DynamoDB Only',
+    'organizations': 'AWS Organizations Only',
+    'combined': 'Both (DynamoDB takes precedence)'
+}
+
+# Order of the mapping sources in the Account Email Mapping sheet
+MAPPING_SOURCE_SORT_PRIORITY = {
+    'Both (DynamoDB takes precedence)': 1,
+    'DynamoDB Only': 2,
+    'AWS Organizations Only': 3,
+    'No mapping found': 4,
+    'Unknown Source': 5
+}
+
+# Excel stores at most this many characters in a single cell
+EXCEL_CELL_CHARACTER_LIMIT = 32767
+EXCEL_TRUNCATION_SUFFIX = "\n... [truncated]"
+
+# Resource ARNs quoted in event descriptions, used when no affected entities are listed
+ARN_PATTERN = re.compile(r'arn:aws:[a-zA-Z0-9\-]+:[a-zA-Z0-9\-]*:\d*:[a-zA-Z0-9\-/._]+')
 
 
 def get_message_retry_count(record):
@@ -31,6 +80,22 @@ def get_message_retry_count(record):
         return 0
 
 
+def resolve_message_body(message):
+    """
+    Fetch the full message body from S3 when the queue manager offloaded it
+    """
+    s3_pointer = message.get('s3_pointer')
+    if not s3_pointer:
+        return message
+    
+    bucket_name, key = s3_pointer[len('s3://'):].split('/', 1)
+    print(f"Loading offloaded message body from {s3_pointer}")
+    
+    s3_client = boto3.client('s3', config=AWS_CLIENT_CONFIG)
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    return json.loads(response['Body'].read())
+
+
 def lambda_handler(event, context):
     """
     Send individual emails from SQS queue
@@ -43,7 +108,7 @@ def lambda_handler(event, context):
     for i, record in enumerate(event['Records'], 1):
         message = None
         try:
-            message = json.loads(record['body'])
+            message = resolve_message_body(json.loads(record['body']))
             email_type = message['email_type']
             
             print(f"Processing message {i}/{len(event['Records'])}: {email_type} email")
@@ -81,8 +146,8 @@ def lambda_handler(event, context):
                     print(f"Failed to send {email_type} email after {max_retries} attempts. Marking as processed to prevent infinite retry.")
             
         except Exception as e:
-            print(f"Error processing email message: {str(e)}")
-            traceback.print_exc()
+            # One write per failed record - print_exc writes the traceback line by line
+            print(f"Error processing email message: {str(e)}\n{traceback.format_exc()}")
             
             # Get retry count for exception handling
             retry_count = get_message_retry_count(record) if record else 0
@@ -136,6 +201,18 @@ def send_account_specific_email(message):
         
         print(f"Sending account-specific email to {email_address} for {len(account_results)} accounts")
         
+        # Get CC email if configured
+        cc_email = os.environ.get('ACCOUNT_SPECIFIC_EMAIL_CC', '').strip()
+        cc_recipients = [cc_email] if cc_email else []
+        
+        if cc_recipients:
+            print(f"Account-specific email will be CC'd to: {cc_email}")
+        else:
+            print("No CC configured for account-specific emails")
+        
+        if not recipients_can_receive([email_address] + cc_recipients):
+            return False
+        
         # Extract events and analysis from results
         all_events = []
         all_analyses = []
@@ -148,25 +225,8 @@ def send_account_specific_email(message):
             account_id = result.get('account_id', 'unknown')
             
             # Merge Bedrock analysis results back into events for spreadsheet columns
-            for event in processed_events:
-                if analysis:
-                    # Update the existing analysis_summary with Bedrock results
-                    current_summary = event.get('analysis_summary', {})
-                    
-                    # Merge Bedrock analysis fields into analysis_summary
-                    current_summary.update({
-                        'risk_level': analysis.get('risk_level', current_summary.get('risk_level', 'Low')),
-                        'risk_category': analysis.get('risk_category', current_summary.get('risk_category', 'Operational')),
-                        'time_sensitivity': analysis.get('time_sensitivity', current_summary.get('time_sensitivity', 'Routine')),
-                        'impact_analysis': analysis.get('impact_analysis', ''),
-                        'consequences_if_ignored': analysis.get('consequences_if_ignored', ''),
-                        'recommended_actions': analysis.get('recommended_actions', []),
-                        'manual_review_required': analysis.get('manual_review_required', False)
-                    })
-                    
-                    # Store the full analysis for reference
-                    event['analysis'] = analysis
-                    event['analysis_summary'] = current_summary
+            if analysis:
+                merge_analysis_into_events(processed_events, analysis)
             
             all_events.extend(processed_events)
             all_analyses.append({
@@ -192,15 +252,6 @@ def send_account_specific_email(message):
             # Create minimal HTML as fallback
             html_content = create_minimal_html_fallback(account_ids, "account-specific")
         
-        # Get CC email if configured
-        cc_email = os.environ.get('ACCOUNT_SPECIFIC_EMAIL_CC', '').strip()
-        cc_recipients = [cc_email] if cc_email else []
-        
-        if cc_recipients:
-            print(f"Account-specific email will be CC'd to: {cc_email}")
-        else:
-            print("No CC configured for account-specific emails")
-        
         # Send email
         success = send_email_with_attachment(
             recipients=[email_address],
@@ -241,6 +292,14 @@ def send_master_report_email(message):
         
         print(f"Sending master report to {len(email_addresses)} recipients for {len(all_results)} accounts")
         
+        # In sandbox mode, look up every mapped address in one batched call up front
+        if should_verify_recipient_email():
+            mapped_emails = [(result.get('result_data') or {}).get('email_mapping') for result in all_results]
+            get_verification_statuses(mapped_emails + email_addresses)
+        
+        if not recipients_can_receive(email_addresses):
+            return False
+        
         # Extract all events and analyses
         all_events = []
         all_analyses = []
@@ -253,34 +312,21 @@ def send_master_report_email(message):
             account_id = result.get('account_id', 'unknown')
             email_mapping = result_data.get('email_mapping')
             
-            # Merge Bedrock analysis results back into events for spreadsheet columns
+            # Determine email status based on SES mode and verification - the same
+            # for every event of this account
+            email_status = determine_email_status(email_mapping)
+            
+            # Add tracking information
+            tracking_fields = {
+                'mapped_email': email_mapping or 'Default Recipients',
+                'email_sent_status': email_status
+            }
             for event in processed_events:
-                # Add tracking information
-                event['mapped_email'] = email_mapping or 'Default Recipients'
-                
-                # Determine email status based on SES mode and verification
-                email_status = determine_email_status(email_mapping)
-                event['email_sent_status'] = email_status
-                
-                # Merge Bedrock analysis results into analysis_summary for spreadsheet
-                if analysis:
-                    # Update the existing analysis_summary with Bedrock results
-                    current_summary = event.get('analysis_summary', {})
-                    
-                    # Merge Bedrock analysis fields into analysis_summary
-                    current_summary.update({
-                        'risk_level': analysis.get('risk_level', current_summary.get('risk_level', 'Low')),
-                        'risk_category': analysis.get('risk_category', current_summary.get('risk_category', 'Operational')),
-                        'time_sensitivity': analysis.get('time_sensitivity', current_summary.get('time_sensitivity', 'Routine')),
-                        'impact_analysis': analysis.get('impact_analysis', ''),
-                        'consequences_if_ignored': analysis.get('consequences_if_ignored', ''),
-                        'recommended_actions': analysis.get('recommended_actions', []),
-                        'manual_review_required': analysis.get('manual_review_required', False)
-                    })
-                    
-                    # Store the full analysis for reference
-                    event['analysis'] = analysis
-                    event['analysis_summary'] = current_summary
+                event.update(tracking_fields)
+            
+            # Merge Bedrock analysis results into analysis_summary for spreadsheet
+            if analysis:
+                merge_analysis_into_events(processed_events, analysis)
             
             all_events.extend(processed_events)
             all_analyses.append({
@@ -328,17 +374,45 @@ def send_master_report_email(message):
         return False
 
 
+def merge_analysis_into_events(events, analysis):
+    """
+    Merge an account's Bedrock analysis into each event's analysis_summary
+    
+    The Bedrock fields are the same for every event of the account, so they are
+    resolved once and applied to each event with a single dict merge.
+    """
+    # Risk fields only override the event's own values when Bedrock provided them
+    summary_overlay = {
+        key: analysis[key]
+        for key in ('risk_level', 'risk_category', 'time_sensitivity')
+        if key in analysis
+    }
+    summary_overlay.update({
+        'impact_analysis': analysis.get('impact_analysis', ''),
+        'consequences_if_ignored': analysis.get('consequences_if_ignored', ''),
+        'recommended_actions': analysis.get('recommended_actions', []),
+        'manual_review_required': analysis.get('manual_review_required', False)
+    })
+    
+    for event in events:
+        event['analysis_summary'] = {
+            **ANALYSIS_SUMMARY_DEFAULTS,
+            **event.get('analysis_summary', {}),
+            **summary_overlay
+        }
+        # Store the full analysis for reference
+        event['analysis'] = analysis
+
+
 def create_account_specific_excel_report(events, analyses, account_ids):
     """
     Create Excel report for specific accounts (simplified version)
     """
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    
-    wb = Workbook()
     
-    # Remove default sheet
-    wb.remove(wb.active)
+    # Write-only mode streams rows out as they are appended instead of keeping
+    # every cell object in memory; it starts with no default sheet
+    wb = Workbook(write_only=True)
     
     # Summary sheet
     summary_sheet = wb.create_sheet("Summary")
@@ -365,26 +439,20 @@ def create_master_excel_report(events, analyses, account_ids, all_results):
     Create comprehensive Excel report with tracking (master version)
     """
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    
-    wb = Workbook()
     
-    # Remove default sheet
-    wb.remove(wb.active)
+    # Write-only mode streams rows out as they are appended instead of keeping
+    # every cell object in memory; it starts with no default sheet
+    wb = Workbook(write_only=True)
     
     # Summary sheet with configuration details
     summary_sheet = wb.create_sheet("Summary")
     create_summary_sheet(summary_sheet, events, analyses, account_ids, is_master=True)
     
-    # All Events sheet with tracking columns
+    # All Events sheet with tracking columns, plus the Critical Events sheet
+    # (always created, even if empty) filled from the same pass
     events_sheet = wb.create_sheet("All Events")
-    create_events_sheet(events_sheet, events, include_tracking=True)
-    
-    # Critical Events sheet (always create, even if empty)
-    critical_events = [e for e in events if e.get('analysis_summary', {}).get('severity') == 'critical' or 
-                      e.get('analysis_summary', {}).get('risk_level') == 'Critical']
     critical_sheet = wb.create_sheet("Critical Events")
-    create_events_sheet(critical_sheet, critical_events, include_tracking=True)
+    create_events_sheet(events_sheet, events, include_tracking=True, critical_sheet=critical_sheet)
     
     # Risk Analysis sheet
     analysis_sheet = wb.create_sheet("Risk Analysis")
@@ -402,94 +470,138 @@ def create_master_excel_report(events, analyses, account_ids, all_results):
     return excel_buffer
 
 
+@lru_cache(maxsize=None)
+def get_report_styles():
+    """
+    Build the report cell styles once per container
+    
+    openpyxl stays a lazy import, and every styled cell shares these objects
+    instead of constructing its own Font and PatternFill.
+    """
+    from openpyxl.styles import Font, PatternFill
+    
+    def solid_fill(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    return {
+        'title_font': Font(size=16, bold=True),
+        'section_font': Font(size=14, bold=True),
+        'attention_font': Font(size=14, bold=True, color="FF6B35"),
+        'attention_note_font': Font(color="856404"),
+        'config_header_font': Font(bold=True, size=12),
+        'header_font': Font(bold=True),
+        'header_fill': solid_fill("CCCCCC"),
+        'warning_font': Font(color="FF6B35"),
+        'warning_fill': solid_fill("FFF3CD"),
+        'timeout_font': Font(color="FF8C00"),  # Orange for timeout
+        'failure_font': Font(color="DC3545"),  # Red for failure
+        'failure_fill': solid_fill("F8D7DA"),
+        'complete_font': Font(color="28A745"),
+        # Mapping Source column colour coding: source -> (fill, font)
+        'mapping_source': {
+            'Both (DynamoDB takes precedence)': (solid_fill("E7F3FF"), Font(color="0066CC")),
+            'DynamoDB Only': (solid_fill("E8F5E8"), Font(color="006600")),
+            'AWS Organizations Only': (solid_fill("FFF3E0"), Font(color="FF8C00")),
+            'No mapping found': (solid_fill("F5F5F5"), Font(color="666666")),
+        },
+    }
+
+
+def create_styled_cell(sheet, value, font=None, fill=None):
+    """
+    Create a styled cell for appending to a write-only sheet
+    """
+    from openpyxl.cell import WriteOnlyCell
+    
+    cell = WriteOnlyCell(sheet, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    return cell
+
+
+def append_header_row(sheet, headers):
+    """
+    Append a bold, grey-filled header row
+    """
+    styles = get_report_styles()
+    sheet.append([create_styled_cell(sheet, header, styles['header_font'], styles['header_fill'])
+                  for header in headers])
+
+
 def create_summary_sheet(sheet, events, analyses, account_ids, is_master=False):
     """
     Create summary sheet
     """
-    from openpyxl.styles import Font, PatternFill, Alignment
+    styles = get_report_styles()
     
     # Title
-    sheet['A1'] = "AWS Health Events Analysis Summary"
-    sheet['A1'].font = Font(size=16, bold=True)
+    sheet.append([create_styled_cell(sheet, "AWS Health Events Analysis Summary", styles['title_font'])])
+    sheet.append([])
     
-    row = 3
+    def add_line(value, font=None, fill=None):
+        sheet.append([create_styled_cell(sheet, value, font, fill)])
     
-    # Check for manual review requirements
-    manual_review_count = len([a for a in analyses if a.get('analysis', {}).get('manual_review_required', False)])
+    def add_blank_lines(count=1):
+        for _ in range(count):
+            sheet.append([])
+    
+    # Count manual reviews and risk levels of the remaining accounts in one pass
+    manual_review_count = 0
+    risk_counts = Counter()
+    for analysis in analyses:
+        analysis_data = analysis.get('analysis', {})
+        if analysis_data.get('manual_review_required', False):
+            manual_review_count += 1
+        else:
+            risk_counts[analysis_data.get('risk_level', 'Low')] += 1
     
     if manual_review_count > 0:
-        sheet[f'A{row}'] = "⚠️ ATTENTION: Manual Review Required"
-        sheet[f'A{row}'].font = Font(size=14, bold=True, color="FF6B35")
-        sheet[f'A{row}'].fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-        row += 1
-        sheet[f'A{row}'] = f"{manual_review_count} account(s) require manual review due to AI analysis unavailability"
-        sheet[f'A{row}'].font = Font(color="856404")
-        row += 2
+        add_line("⚠️ ATTENTION: Manual Review Required",
+                 styles['attention_font'], styles['warning_fill'])
+        add_line(f"{manual_review_count} account(s) require manual review due to AI analysis unavailability",
+                 styles['attention_note_font'])
+        add_blank_lines()
     
     # Basic statistics
-    sheet[f'A{row}'] = "Analysis Statistics"
-    sheet[f'A{row}'].font = Font(size=14, bold=True)
-    row += 1
-    
-    sheet[f'A{row}'] = f"Total Events: {len(events)}"
-    row += 1
-    sheet[f'A{row}'] = f"Total Accounts: {len(account_ids)}"
-    row += 1
+    add_line("Analysis Statistics", styles['section_font'])
+    add_line(f"Total Events: {len(events)}")
+    add_line(f"Total Accounts: {len(account_ids)}")
     
     if manual_review_count > 0:
-        sheet[f'A{row}'] = f"Manual Review Required: {manual_review_count} accounts"
-        sheet[f'A{row}'].font = Font(color="FF6B35")
-        row += 1
+        add_line(f"Manual Review Required: {manual_review_count} accounts", styles['warning_font'])
     
     # Event severity breakdown
-    severity_counts = {}
-    for event in events:
-        severity = event.get('severity', 'low')
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
+    severity_counts = Counter(event.get('severity', 'low') for event in events)
     
     for severity, count in severity_counts.items():
-        sheet[f'A{row}'] = f"{severity.title()} Events: {count}"
-        row += 1
+        add_line(f"{severity.title()} Events: {count}")
     
-    row += 1
+    add_blank_lines()
     
     # Risk analysis summary
-    sheet[f'A{row}'] = "Risk Analysis Summary"
-    sheet[f'A{row}'].font = Font(size=14, bold=True)
-    row += 1
-    
-    risk_counts = {}
-    for analysis in analyses:
-        analysis_data = analysis.get('analysis', {})
-        if not analysis_data.get('manual_review_required', False):
-            risk_level = analysis_data.get('risk_level', 'Low')
-            risk_counts[risk_level] = risk_counts.get(risk_level, 0) + 1
+    add_line("Risk Analysis Summary", styles['section_font'])
     
     for risk, count in risk_counts.items():
-        sheet[f'A{row}'] = f"{risk} Risk Accounts: {count}"
-        row += 1
+        add_line(f"{risk} Risk Accounts: {count}")
     
     # Configuration info for master reports
     if is_master:
-        row += 5  # Move Configuration section down to row 18 (was row 15)
-        sheet[f'A{row}'] = "Configuration"
-        sheet[f'A{row}'].font = Font(size=14, bold=True)
-        row += 1
-        
-        sheet[f'A{row}'] = f"Custom Mapping Enabled: {os.environ.get('USE_CUSTOM_ACCOUNT_EMAIL_MAPPING', 'false')}"
-        row += 1
-        sheet[f'A{row}'] = f"Organizations Mapping Enabled: {os.environ.get('USE_ORGANIZATION_ACCOUNT_EMAIL_MAPPING', 'false')}"
-        row += 1
-        sheet[f'A{row}'] = f"Default Recipients: {os.environ.get('RECIPIENT_EMAILS', 'Not configured')}"
-        row += 1
+        add_blank_lines(5)  # Keep the Configuration section clear of the risk summary
+        add_line("Configuration", styles['section_font'])
+        add_line(f"Custom Mapping Enabled: {os.environ.get('USE_CUSTOM_ACCOUNT_EMAIL_MAPPING', 'false')}")
+        add_line(f"Organizations Mapping Enabled: {os.environ.get('USE_ORGANIZATION_ACCOUNT_EMAIL_MAPPING', 'false')}")
+        add_line(f"Default Recipients: {os.environ.get('RECIPIENT_EMAILS', 'Not configured')}")
 
 
-def create_events_sheet(sheet, events, include_tracking=False):
+def create_events_sheet(sheet, events, include_tracking=False, critical_sheet=None):
     """
     Create events sheet with correct column structure
-    """
-    from openpyxl.styles import Font, PatternFill, Alignment
     
+    When critical_sheet is given, critical events are also appended to it, so
+    each row is built once even though it is written to both sheets.
+    """
     # Headers as specified
     headers = [
         "Event ARN", "Event Type", "Region", "Start Time", "Last Update", 
@@ -502,201 +614,206 @@ def create_events_sheet(sheet, events, include_tracking=False):
         headers.extend(["Mapped Email", "Email Status"])
     
     # Write headers
-    for col, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-    
-    # Write data
-    for row, event in enumerate(events, 2):
-        analysis = event.get('analysis_summary', {})
-        
-        sheet.cell(row=row, column=1, value=event.get('arn', ''))
-        sheet.cell(row=row, column=2, value=event.get('eventTypeCode', ''))
-        sheet.cell(row=row, column=3, value=event.get('region', ''))
-        sheet.cell(row=row, column=4, value=str(event.get('startTime', '')))
-        sheet.cell(row=row, column=5, value=str(event.get('lastUpdatedTime', '')))
-        sheet.cell(row=row, column=6, value=event.get('eventTypeCategory', ''))
-        
-        # Try multiple sources for event description
-        description = (
-            event.get('eventDescription', '') or 
-            event.get('description', '') or 
-            analysis.get('description_preview', '') or
-            analysis.get('description', '') or
-            event.get('message', '') or
-            ''
-        )
-        sheet.cell(row=row, column=7, value=description[:500] if description else 'No description available')
-        
-        # Critical flag
-        is_critical = analysis.get('severity') == 'critical' or analysis.get('risk_level') == 'Critical'
-        sheet.cell(row=row, column=8, value='Yes' if is_critical else 'No')
-        
-        # Risk level with manual review indicator
-        risk_level = analysis.get('risk_level', 'Low')
-        manual_review = event.get('analysis', {}).get('manual_review_required', False)
-        if manual_review:
-            risk_level = f"MANUAL REVIEW - {risk_level}"
-        sheet.cell(row=row, column=9, value=risk_level)
-        sheet.cell(row=row, column=10, value=event.get('accountId', ''))
-        sheet.cell(row=row, column=11, value=str(event.get('startTime', '')))  # Key Date same as Start Time
-        sheet.cell(row=row, column=12, value=analysis.get('time_sensitivity', 'Normal'))
-        sheet.cell(row=row, column=13, value=analysis.get('risk_category', 'Operational'))
-        
-        # Required Actions
-        actions = analysis.get('recommended_actions', [])
-        if isinstance(actions, list) and actions:
-            # Handle list of action objects
-            actions_text = '; '.join([f"{a.get('action', '') if isinstance(a, dict) else str(a)}" for a in actions[:3] if a])
-        elif isinstance(actions, str):
-            # Handle string directly
-            actions_text = actions[:200]
-        else:
-            # Fallback to required_actions field if recommended_actions is not available
-            required_actions = analysis.get('required_actions', '')
-            actions_text = str(required_actions)[:200] if required_actions else ''
-        sheet.cell(row=row, column=14, value=actions_text)
-        
-        # Impact Analysis - ensure it's a string before slicing
-        impact_analysis = analysis.get('impact_analysis', '') or ''
-        sheet.cell(row=row, column=15, value=str(impact_analysis)[:300])
-        
-        # Consequences If Ignored - ensure it's a string before slicing
-        consequences = analysis.get('consequences_if_ignored', '') or ''
-        sheet.cell(row=row, column=16, value=str(consequences)[:300])
-        
-        # Affected Resources - show actual resource ARNs/IDs
-        affected_entities = event.get('affectedEntities', [])
-        if affected_entities:
-            # Extract resource ARNs/IDs from affected entities
-            resources = []
-            for entity in affected_entities[:5]:  # Limit to first 5 resources
-                entity_value = entity.get('entityValue', '')
-                entity_url = entity.get('entityUrl', '')
-                
-                # Prefer entityValue (usually contains ARN or resource ID)
-                if entity_value:
-                    resources.append(entity_value)
-                elif entity_url:
-                    resources.append(entity_url)
-            
-            resources_text = ', '.join(resources) if resources else f"Account: {event.get('accountId', 'Unknown')}"
-        else:
-            # Fallback: try to get from event description or use account ID
-            event_description = event.get('eventDescription', '')
-            
-            # Look for ARN patterns in the description
-            import re
-            arn_pattern = r'arn:aws:[a-zA-Z0-9\-]+:[a-zA-Z0-9\-]*:\d*:[a-zA-Z0-9\-/._]+'
-            arns = re.findall(arn_pattern, event_description)
+    append_header_row(sheet, headers)
+    if critical_sheet is not None:
+        append_header_row(critical_sheet, headers)
+    
+    # Write data - one append per event instead of a cell lookup per column
+    for event in events:
+        row_values, is_critical = build_event_row(event, include_tracking)
+        sheet.append(row_values)
+        if is_critical and critical_sheet is not None:
+            critical_sheet.append(row_values)
+
+
+def build_event_row(event, include_tracking=False):
+    """
+    Build the events sheet row values for one event
+    
+    Returns:
+        tuple: (row values list, whether the event is critical)
+    """
+    analysis = event.get('analysis_summary', {})
+    start_time = str(event.get('startTime', ''))
+    
+    row_values = [
+        event.get('arn', ''),
+        event.get('eventTypeCode', ''),
+        event.get('region', ''),
+        start_time,
+        str(event.get('lastUpdatedTime', '')),
+        event.get('eventTypeCategory', ''),
+    ]
+    
+    # Try multiple sources for event description
+    description = (
+        event.get('eventDescription', '') or 
+        event.get('description', '') or 
+        analysis.get('description_preview', '') or
+        analysis.get('description', '') or
+        event.get('message', '') or
+        ''
+    )
+    row_values.append(description[:500] if description else 'No description available')
+    
+    # Critical flag
+    is_critical = analysis.get('severity') == 'critical' or analysis.get('risk_level') == 'Critical'
+    row_values.append('Yes' if is_critical else 'No')
+    
+    # Risk level with manual review indicator
+    risk_level = analysis.get('risk_level', 'Low')
+    manual_review = event.get('analysis', {}).get('manual_review_required', False)
+    if manual_review:
+        risk_level = f"MANUAL REVIEW - {risk_level}"
+    row_values.extend([
+        risk_level,
+        event.get('accountId', ''),
+        start_time,  # Key Date same as Start Time
+        analysis.get('time_sensitivity', 'Normal'),
+        analysis.get('risk_category', 'Operational'),
+    ])
+    
+    # Required Actions
+    actions = analysis.get('recommended_actions', [])
+    if isinstance(actions, list) and actions:
+        # Handle list of action objects
+        actions_text = '; '.join([f"{a.get('action', '') if isinstance(a, dict) else str(a)}" for a in actions[:3] if a])
+    elif isinstance(actions, str):
+        # Handle string directly
+        actions_text = actions[:200]
+    else:
+        # Fallback to required_actions field if recommended_actions is not available
+        required_actions = analysis.get('required_actions', '')
+        actions_text = str(required_actions)[:200] if required_actions else ''
+    row_values.append(actions_text)
+    
+    # Impact Analysis - ensure it's a string before slicing
+    impact_analysis = analysis.get('impact_analysis', '') or ''
+    row_values.append(str(impact_analysis)[:300])
+    
+    # Consequences If Ignored - ensure it's a string before slicing
+    consequences = analysis.get('consequences_if_ignored', '') or ''
+    row_values.append(str(consequences)[:300])
+    
+    # Affected Resources - show actual resource ARNs/IDs
+    affected_entities = event.get('affectedEntities', [])
+    if affected_entities:
+        # Extract resource ARNs/IDs from affected entities
+        resources = []
+        for entity in affected_entities[:5]:  # Limit to first 5 resources
+            entity_value = entity.get('entityValue', '')
+            entity_url = entity.get('entityUrl', '')
             
-            if arns:
-                resources_text = ', '.join(arns[:3])  # Limit to first 3 ARNs found
-            else:
-                resources_text = f"Account: {event.get('accountId', 'Unknown')}"
+            # Prefer entityValue (usually contains ARN or resource ID)
+            if entity_value:
+                resources.append(entity_value)
+            elif entity_url:
+                resources.append(entity_url)
+        
+        resources_text = ', '.join(resources) if resources else f"Account: {event.get('accountId', 'Unknown')}"
+    else:
+        # Fallback: try to get from event description or use account ID
+        event_description = event.get('eventDescription', '')
         
-        sheet.cell(row=row, column=17, value=resources_text)
+        # Look for ARN patterns in the description
+        arns = ARN_PATTERN.findall(event_description)
         
-        if include_tracking:
-            sheet.cell(row=row, column=18, value=event.get('mapped_email', ''))
-            sheet.cell(row=row, column=19, value=event.get('email_sent_status', ''))
+        if arns:
+            resources_text = ', '.join(arns[:3])  # Limit to first 3 ARNs found
+        else:
+            resources_text = f"Account: {event.get('accountId', 'Unknown')}"
+    
+    row_values.append(resources_text)
+    
+    if include_tracking:
+        row_values.append(event.get('mapped_email', ''))
+        row_values.append(event.get('email_sent_status', ''))
+    
+    return row_values, is_critical
 
 
 def create_analysis_sheet(sheet, analyses):
     """
     Create risk analysis sheet with correct column structure
     """
-    from openpyxl.styles import Font, PatternFill, Alignment
+    styles = get_report_styles()
     
     # Headers as specified
     headers = ["Account ID", "Event Type", "Region", "Risk Level", "Analysis Status", "Full Analysis"]
-    
-    for col, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+    append_header_row(sheet, headers)
     
     # Write data - one row per account with analysis summary
-    row = 2
     for analysis in analyses:
         analysis_data = analysis.get('analysis', {})
         account_id = analysis.get('account_id', '')
         manual_review = analysis_data.get('manual_review_required', False)
         
-        # Account ID
-        sheet.cell(row=row, column=1, value=account_id)
-        
         # Event Type - summarize
         processed_events = analysis_data.get('processed_events', [])
         if processed_events:
-            event_types = list(set([e.get('eventTypeCode', '') for e in processed_events[:3]]))
-            event_type_summary = ', '.join(event_types)
+            event_type_summary = ', '.join({e.get('eventTypeCode', '') for e in processed_events[:3]})
             if len(processed_events) > 3:
                 event_type_summary += f" (+{len(processed_events)-3} more)"
         else:
             event_type_summary = 'Multiple Events'
-        sheet.cell(row=row, column=2, value=event_type_summary)
         
         # Region - summarize
         if processed_events:
-            regions = list(set([e.get('region', '') for e in processed_events[:3]]))
-            region_summary = ', '.join(regions)
-            if len(set([e.get('region', '') for e in processed_events])) > 3:
-                region_summary += " (+more)"
+            region_summary = ', '.join({e.get('region', '') for e in processed_events[:3]})
+            # Stop collecting once a fourth distinct region shows up
+            distinct_regions = set()
+            for e in processed_events:
+                distinct_regions.add(e.get('region', ''))
+                if len(distinct_regions) > 3:
+                    region_summary += " (+more)"
+                    break
         else:
             region_summary = 'Multiple Regions'
-        sheet.cell(row=row, column=3, value=region_summary)
         
         # Risk Level
         risk_level = analysis_data.get('risk_level', 'Low')
         if manual_review:
             risk_level = f"MANUAL REVIEW - {risk_level}"
-        sheet.cell(row=row, column=4, value=risk_level)
         
         # Analysis Status - Check for different failure types
         bedrock_failure = analysis_data.get('bedrock_failure', False)
         failure_reason = analysis_data.get('failure_reason', '')
         error_type = analysis_data.get('error', '')
         
+        # Lowercased once per row - both the status cell and the JSON status branch on them
+        failure_reason_lower = failure_reason.lower()
+        error_type_lower = error_type.lower()
+        throttled = bedrock_failure and ('throttling' in failure_reason_lower or 'throttling' in error_type_lower)
+        rate_limited = bedrock_failure and ('rate limit' in failure_reason_lower or 'rate limit' in error_type_lower)
+        
         if manual_review:
             # Determine specific failure type for better messaging
-            if bedrock_failure and ('throttling' in failure_reason.lower() or 'throttling' in error_type.lower()):
-                status = "⏱️ AI TIMEOUT - Bedrock Throttled"
-                cell = sheet.cell(row=row, column=5, value=status)
-                cell.font = Font(color="FF8C00")  # Orange for timeout
-                cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-            elif bedrock_failure and ('rate limit' in failure_reason.lower() or 'rate limit' in error_type.lower()):
-                status = "⏱️ AI TIMEOUT - Rate Limited"
-                cell = sheet.cell(row=row, column=5, value=status)
-                cell.font = Font(color="FF8C00")  # Orange for timeout
-                cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
+            if throttled:
+                status_cell = create_styled_cell(
+                    sheet, "⏱️ AI TIMEOUT - Bedrock Throttled",
+                    styles['timeout_font'], styles['warning_fill'])
+            elif rate_limited:
+                status_cell = create_styled_cell(
+                    sheet, "⏱️ AI TIMEOUT - Rate Limited",
+                    styles['timeout_font'], styles['warning_fill'])
             elif bedrock_failure:
-                status = "❌ AI FAILED - Service Error"
-                cell = sheet.cell(row=row, column=5, value=status)
-                cell.font = Font(color="DC3545")  # Red for failure
-                cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+                status_cell = create_styled_cell(
+                    sheet, "❌ AI FAILED - Service Error",
+                    styles['failure_font'], styles['failure_fill'])
             else:
-                status = "⚠️ PLACEHOLDER - Manual Review Required"
-                cell = sheet.cell(row=row, column=5, value=status)
-                cell.font = Font(color="FF6B35")
-                cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
+                status_cell = create_styled_cell(
+                    sheet, "⚠️ PLACEHOLDER - Manual Review Required",
+                    styles['warning_font'], styles['warning_fill'])
         else:
-            status = "✅ AI Analysis Complete"
-            cell = sheet.cell(row=row, column=5, value=status)
-            cell.font = Font(color="28A745")
+            status_cell = create_styled_cell(sheet, "✅ AI Analysis Complete", styles['complete_font'])
         
         # Full Analysis - JSON response
         if manual_review:
             # Determine specific analysis status based on failure type
-            bedrock_failure = analysis_data.get('bedrock_failure', False)
-            failure_reason = analysis_data.get('failure_reason', '')
-            error_type = analysis_data.get('error', '')
-            
-            if bedrock_failure and ('throttling' in failure_reason.lower() or 'throttling' in error_type.lower()):
+            if throttled:
                 analysis_status = 'AI_ANALYSIS_TIMEOUT_THROTTLED'
                 guidance = 'AI analysis timed out due to Bedrock throttling. Please review events manually and consult AWS Health Dashboard'
-            elif bedrock_failure and ('rate limit' in failure_reason.lower() or 'rate limit' in error_type.lower()):
+            elif rate_limited:
                 analysis_status = 'AI_ANALYSIS_TIMEOUT_RATE_LIMITED'
                 guidance = 'AI analysis timed out due to rate limiting. Please review events manually and consult AWS Health Dashboard'
             elif bedrock_failure:
@@ -726,25 +843,30 @@ def create_analysis_sheet(sheet, analyses):
                 'analysis_data': analysis_data
             }
         
+        # Analyses carrying many processed events can exceed what one cell holds
         full_analysis_json = json.dumps(full_analysis, indent=2, default=str)
-        sheet.cell(row=row, column=6, value=full_analysis_json)
-        row += 1
+        if len(full_analysis_json) > EXCEL_CELL_CHARACTER_LIMIT:
+            # Mark the cut so the cell is not mistaken for the complete analysis
+            full_analysis_json = (full_analysis_json[:EXCEL_CELL_CHARACTER_LIMIT - len(EXCEL_TRUNCATION_SUFFIX)]
+                                  + EXCEL_TRUNCATION_SUFFIX)
+        sheet.append([account_id, event_type_summary, region_summary, risk_level, status_cell, full_analysis_json])
 
 
 def create_account_mapping_sheet(sheet, all_results):
     """
     Create account email mapping sheet showing all available mappings from both sources
     """
-    from openpyxl.styles import Font, PatternFill, Alignment
     from shared_utils import get_combined_account_email_mapping
     
+    styles = get_report_styles()
+    
     # Headers
     headers = ["Account ID", "Email Address", "Mapping Source"]
+    append_header_row(sheet, headers)
     
-    for col, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+    # Rows are collected before writing, since write-only sheets cannot be
+    # rewritten if the fallback below takes over
+    rows = []
     
     # Get all available mappings from both sources
     try:
@@ -755,29 +877,16 @@ def create_account_mapping_sheet(sheet, all_results):
         
         # Add all accounts that have mappings
         for account_id, email in account_to_email.items():
-            source = mapping_sources.get(account_id, 'unknown')
-            
             # Convert source codes to readable descriptions
-            if source == 'custom':
-                source_desc = 'DynamoDB Only'
-            elif source == 'organizations':
-                source_desc = 'AWS Organizations Only'
-            elif source == 'combined':
-                source_desc = 'Both (DynamoDB takes precedence)'
-            else:
-                source_desc = 'Unknown Source'
-            
             mappings.append({
                 'account_id': account_id,
                 'email': email,
-                'source': source_desc
+                'source': MAPPING_SOURCE_DESCRIPTIONS.get(mapping_sources.get(account_id), 'Unknown Source')
             })
         
         # Add accounts from workflow results that don't have mappings
-        workflow_accounts = set()
         for result in all_results:
             account_id = result.get('account_id', 'unknown')
-            workflow_accounts.add(account_id)
             
             # If this account wasn't in the mappings, add it as default
             if account_id not in account_to_email and account_id != 'unknown':
@@ -788,65 +897,40 @@ def create_account_mapping_sheet(sheet, all_results):
                 })
         
         # Sort by source type, then email, then account
-        def sort_key(mapping):
-            source_priority = {
-                'Both (DynamoDB takes precedence)': 1,
-                'DynamoDB Only': 2,
-                'AWS Organizations Only': 3,
-                'No mapping found': 4,
-                'Unknown Source': 5
-            }
-            return (source_priority.get(mapping['source'], 6), mapping['email'], mapping['account_id'])
-        
-        mappings.sort(key=sort_key)
+        mappings.sort(key=lambda mapping: (
+            MAPPING_SOURCE_SORT_PRIORITY.get(mapping['source'], 6), mapping['email'], mapping['account_id']
+        ))
         
-        # Write data
-        for row, mapping in enumerate(mappings, 2):
-            sheet.cell(row=row, column=1, value=mapping['account_id'])
-            sheet.cell(row=row, column=2, value=mapping['email'])
-            
+        # Build data rows
+        for mapping in mappings:
             # Color code the source column
-            source_cell = sheet.cell(row=row, column=3, value=mapping['source'])
+            source_fill, source_font = styles['mapping_source'].get(mapping['source'], (None, None))
+            source_cell = create_styled_cell(sheet, mapping['source'], source_font, source_fill)
             
-            if mapping['source'] == 'Both (DynamoDB takes precedence)':
-                source_cell.fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                source_cell.font = Font(color="0066CC")
-            elif mapping['source'] == 'DynamoDB Only':
-                source_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                source_cell.font = Font(color="006600")
-            elif mapping['source'] == 'AWS Organizations Only':
-                source_cell.fill = PatternFill(start_color="FFF3E0", end_color="FFF3E0", fill_type="solid")
-                source_cell.font = Font(color="FF8C00")
-            elif mapping['source'] == 'No mapping found':
-                source_cell.fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-                source_cell.font = Font(color="666666")
-        
-        # Add configuration info at the bottom
+            rows.append([mapping['account_id'], mapping['email'], source_cell])
+        
+        # Add configuration info at the bottom, two rows below the data
         if mappings:
-            config_row = len(mappings) + 4
+            rows.extend([[], []])
             
             # Configuration header
-            config_header = sheet.cell(row=config_row, column=1, value="Configuration:")
-            config_header.font = Font(bold=True, size=12)
-            config_row += 1
+            rows.append([create_styled_cell(sheet, "Configuration:", styles['config_header_font'])])
             
             # Show current configuration
             use_custom = os.environ.get('USE_CUSTOM_ACCOUNT_EMAIL_MAPPING', 'false').lower() == 'true'
             use_org = os.environ.get('USE_ORGANIZATION_ACCOUNT_EMAIL_MAPPING', 'false').lower() == 'true'
             
-            sheet.cell(row=config_row, column=1, value=f"DynamoDB Mapping Enabled: {'Yes' if use_custom else 'No'}")
-            config_row += 1
-            sheet.cell(row=config_row, column=1, value=f"AWS Organizations Mapping Enabled: {'Yes' if use_org else 'No'}")
-            config_row += 1
+            rows.append([f"DynamoDB Mapping Enabled: {'Yes' if use_custom else 'No'}"])
+            rows.append([f"AWS Organizations Mapping Enabled: {'Yes' if use_org else 'No'}"])
             
             if use_custom and use_org:
-                sheet.cell(row=config_row, column=1, value="Priority: DynamoDB overrides AWS Organizations when both exist")
+                rows.append(["Priority: DynamoDB overrides AWS Organizations when both exist"])
             elif use_custom:
-                sheet.cell(row=config_row, column=1, value="Source: DynamoDB mappings only")
+                rows.append(["Source: DynamoDB mappings only"])
             elif use_org:
-                sheet.cell(row=config_row, column=1, value="Source: AWS Organizations mappings only")
+                rows.append(["Source: AWS Organizations mappings only"])
             else:
-                sheet.cell(row=config_row, column=1, value="Source: No automatic mapping configured")
+                rows.append(["Source: No automatic mapping configured"])
         
     except Exception as e:
         print(f"Error creating account mapping sheet: {e}")
@@ -870,107 +954,101 @@ def create_account_mapping_sheet(sheet, all_results):
                     'source': 'No mapping found'
                 })
         
-        # Write fallback data
-        for row, mapping in enumerate(mappings, 2):
-            sheet.cell(row=row, column=1, value=mapping['account_id'])
-            sheet.cell(row=row, column=2, value=mapping['email'])
-            sheet.cell(row=row, column=3, value=mapping['source'])
+        # Fallback data
+        rows = [[mapping['account_id'], mapping['email'], mapping['source']] for mapping in mappings]
+    
+    for row in rows:
+        sheet.append(row)
 
 
 def create_account_specific_html_content(analyses, account_ids):
     """
     Create HTML content for account-specific emails
     """
-    customer_name = os.environ.get('CUSTOMER_NAME', 'AWS Health Events')
-    
-    # Check for manual review requirements
-    manual_review_accounts = [a for a in analyses if a.get('analysis', {}).get('manual_review_required', False)]
+    customer_name = CUSTOMER_NAME
     
-    html = f"""
-    <html>
-    <body>
-        <h2>{customer_name} - AWS Health Events Analysis</h2>
-        <p>This report contains AWS Health events analysis for your accounts: {', '.join(account_ids[:5])}</p>
-    """
+    # Classify manual review failures and build the summary rows in a single pass
+    manual_review_counts = Counter()
+    summary_rows = []
     
-    if manual_review_accounts:
-        # Categorize the manual review accounts by failure type
-        timeout_accounts = []
-        failed_accounts = []
-        other_accounts = []
+    for analysis in analyses:
+        account_id = analysis['account_id']
+        analysis_data = analysis.get('analysis', {})
+        risk_level = analysis_data.get('risk_level', 'Low')
+        event_count = analysis.get('event_count', 0)
+        manual_review = analysis_data.get('manual_review_required', False)
         
-        for account in manual_review_accounts:
-            analysis_data = account.get('analysis', {})
+        # Determine status indicator based on failure type
+        if manual_review:
             bedrock_failure = analysis_data.get('bedrock_failure', False)
-            failure_reason = analysis_data.get('failure_reason', '')
-            error_type = analysis_data.get('error', '')
+            failure_reason = analysis_data.get('failure_reason', '').lower()
+            error_type = analysis_data.get('error', '').lower()
             
-            if bedrock_failure and ('throttling' in failure_reason.lower() or 'rate limit' in failure_reason.lower() or 'throttling' in error_type.lower()):
-                timeout_accounts.append(account)
+            if bedrock_failure and ('throttling' in failure_reason or 'rate limit' in failure_reason or 'throttling' in error_type):
+                manual_review_counts['timeout'] += 1
             elif bedrock_failure:
-                failed_accounts.append(account)
+                manual_review_counts['failed'] += 1
             else:
-                other_accounts.append(account)
-        
-        html += f"""
+                manual_review_counts['other'] += 1
+            
+            if bedrock_failure and ('throttling' in failure_reason or 'throttling' in error_type):
+                status_indicator = "⏱️ AI TIMEOUT (Throttled)"
+            elif bedrock_failure and ('rate limit' in failure_reason or 'rate limit' in error_type):
+                status_indicator = "⏱️ AI TIMEOUT (Rate Limited)"
+            elif bedrock_failure:
+                status_indicator = "❌ AI FAILED"
+            else:
+                status_indicator = "🔍 MANUAL REVIEW"
+        else:
+            status_indicator = f"{risk_level} risk"
+        summary_rows.append(f"<li><strong>Account {account_id}</strong>: {status_indicator}, {event_count} events</li>")
+    
+    manual_review_total = sum(manual_review_counts.values())
+    
+    html_parts = [f"""
+    <html>
+    <body>
+        <h2>{customer_name} - AWS Health Events Analysis</h2>
+        <p>This report contains AWS Health events analysis for your accounts: {', '.join(account_ids[:5])}</p>
+    """]
+    
+    if manual_review_total:
+        html_parts.append(f"""
         <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; margin: 10px 0; border-radius: 5px;">
             <h3 style="color: #856404; margin-top: 0;">⚠️ Manual Review Required</h3>
             <p style="color: #856404; margin-bottom: 10px;">
-                <strong>{len(manual_review_accounts)} account(s)</strong> require manual review:
+                <strong>{manual_review_total} account(s)</strong> require manual review:
             </p>
-            <ul style="color: #856404; margin: 0; padding-left: 20px;">"""
+            <ul style="color: #856404; margin: 0; padding-left: 20px;">""")
         
-        if timeout_accounts:
-            html += f"""
-                <li><strong>{len(timeout_accounts)} account(s)</strong> - AI analysis timed out due to Bedrock throttling/rate limiting</li>"""
+        if manual_review_counts['timeout']:
+            html_parts.append(f"""
+                <li><strong>{manual_review_counts['timeout']} account(s)</strong> - AI analysis timed out due to Bedrock throttling/rate limiting</li>""")
         
-        if failed_accounts:
-            html += f"""
-                <li><strong>{len(failed_accounts)} account(s)</strong> - AI analysis failed due to service errors</li>"""
+        if manual_review_counts['failed']:
+            html_parts.append(f"""
+                <li><strong>{manual_review_counts['failed']} account(s)</strong> - AI analysis failed due to service errors</li>""")
         
-        if other_accounts:
-            html += f"""
-                <li><strong>{len(other_accounts)} account(s)</strong> - AI analysis unavailable for other reasons</li>"""
+        if manual_review_counts['other']:
+            html_parts.append(f"""
+                <li><strong>{manual_review_counts['other']} account(s)</strong> - AI analysis unavailable for other reasons</li>""")
         
-        html += f"""
+        html_parts.append(f"""
             </ul>
             <p style="color: #856404; margin-top: 10px; margin-bottom: 0;">
                 Please review the detailed events in the attached Excel report and consult the AWS Health Dashboard.
             </p>
         </div>
-        """
+        """)
     
-    html += """
+    html_parts.append("""
         <h3>Summary</h3>
         <ul>
-    """
+    """)
     
-    for analysis in analyses:
-        account_id = analysis['account_id']
-        analysis_data = analysis.get('analysis', {})
-        risk_level = analysis_data.get('risk_level', 'Low')
-        event_count = analysis.get('event_count', 0)
-        manual_review = analysis_data.get('manual_review_required', False)
-        
-        # Determine status indicator based on failure type
-        if manual_review:
-            bedrock_failure = analysis_data.get('bedrock_failure', False)
-            failure_reason = analysis_data.get('failure_reason', '')
-            error_type = analysis_data.get('error', '')
-            
-            if bedrock_failure and ('throttling' in failure_reason.lower() or 'throttling' in error_type.lower()):
-                status_indicator = "⏱️ AI TIMEOUT (Throttled)"
-            elif bedrock_failure and ('rate limit' in failure_reason.lower() or 'rate limit' in error_type.lower()):
-                status_indicator = "⏱️ AI TIMEOUT (Rate Limited)"
-            elif bedrock_failure:
-                status_indicator = "❌ AI FAILED"
-            else:
-                status_indicator = "🔍 MANUAL REVIEW"
-        else:
-            status_indicator = f"{risk_level} risk"
-        html += f"<li><strong>Account {account_id}</strong>: {status_indicator}, {event_count} events</li>"
+    html_parts.extend(summary_rows)
     
-    html += """
+    html_parts.append("""
         </ul>
         
         <p>Please see the attached Excel report for detailed analysis and recommended actions.</p>
@@ -978,22 +1056,22 @@ def create_account_specific_html_content(analyses, account_ids):
         <p>This is an automated report from the AWS Health Events Analyzer.</p>
     </body>
     </html>
-    """
+    """)
     
-    return html
+    return ''.join(html_parts)
 
 
 def create_master_html_content(analyses, account_ids):
     """
     Create HTML content for master report emails
     """
-    customer_name = os.environ.get('CUSTOMER_NAME', 'AWS Health Events')
+    customer_name = CUSTOMER_NAME
     
     # Calculate summary statistics
     total_accounts = len(account_ids)
     total_events = sum(a.get('event_count', 0) for a in analyses)
     
-    risk_counts = {}
+    risk_counts = Counter()
     manual_review_count = 0
     
     for analysis in analyses:
@@ -1001,18 +1079,17 @@ def create_master_html_content(analyses, account_ids):
         if analysis_data.get('manual_review_required', False):
             manual_review_count += 1
         else:
-            risk_level = analysis_data.get('risk_level', 'Low')
-            risk_counts[risk_level] = risk_counts.get(risk_level, 0) + 1
+            risk_counts[analysis_data.get('risk_level', 'Low')] += 1
     
-    html = f"""
+    html_parts = [f"""
     <html>
     <body>
         <h2>{customer_name} - AWS Health Events Master Report</h2>
         <p>This is the comprehensive master report containing all AWS Health events across your organization.</p>
-    """
+    """]
     
     if manual_review_count > 0:
-        html += f"""
+        html_parts.append(f"""
         <div style="background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; margin: 15px 0; border-radius: 5px;">
             <h3 style="color: #856404; margin-top: 0;">⚠️ Manual Review Required</h3>
             <p style="color: #856404; margin-bottom: 0;">
@@ -1020,9 +1097,9 @@ def create_master_html_content(analyses, account_ids):
                 These accounts are marked in the Excel report and should be prioritized for manual assessment.
             </p>
         </div>
-        """
+        """)
     
-    html += f"""
+    html_parts.append(f"""
         <h3>Executive Summary</h3>
         <ul>
             <li><strong>Total Accounts Analyzed:</strong> {total_accounts}</li>
@@ -1031,24 +1108,24 @@ def create_master_html_content(analyses, account_ids):
         
         <h3>Analysis Status</h3>
         <ul>
-    """
+    """)
     
     if manual_review_count > 0:
-        html += f"<li><strong>Manual Review Required:</strong> {manual_review_count} accounts</li>"
+        html_parts.append(f"<li><strong>Manual Review Required:</strong> {manual_review_count} accounts</li>")
     
-    html += """
+    html_parts.append("""
         </ul>
         
         <h3>Risk Distribution</h3>
         <ul>
-    """
+    """)
     
     for risk_level in ['Critical', 'High', 'Medium', 'Low']:
-        count = risk_counts.get(risk_level, 0)
+        count = risk_counts[risk_level]
         if count > 0:
-            html += f"<li><strong>{risk_level} Risk Accounts:</strong> {count}</li>"
+            html_parts.append(f"<li><strong>{risk_level} Risk Accounts:</strong> {count}</li>")
     
-    html += """
+    html_parts.append("""
         </ul>
         
         <h3>Report Contents</h3>
@@ -1064,20 +1141,21 @@ def create_master_html_content(analyses, account_ids):
         <p>This is an automated report from the AWS Health Events Analyzer.</p>
     </body>
     </html>
-    """
+    """)
     
-    return html
+    return ''.join(html_parts)
 
 
 def create_email_subject(events, analyses, account_ids, is_master=False):
     """
     Create email subject line
     """
-    customer_name = os.environ.get('CUSTOMER_NAME', 'AWS Health Events')
+    customer_name = CUSTOMER_NAME
     
-    # Count events by severity and risk
-    critical_events = len([e for e in events if e.get('severity') == 'critical'])
-    high_events = len([e for e in events if e.get('severity') == 'high'])
+    # Count events by severity in a single pass
+    severity_counts = Counter(e.get('severity') for e in events)
+    critical_events = severity_counts['critical']
+    high_events = severity_counts['high']
     total_events = len(events)
     
     if is_master:
@@ -1098,16 +1176,18 @@ def check_email_already_sent(email_key):
     Check if an email was already sent using DynamoDB
     """
     try:
-        dynamodb = boto3.resource('dynamodb')
+        # Existence check only - the low-level client avoids Resource deserialization
+        dynamodb_client = boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
         table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
-        table = dynamodb.Table(table_name)
         
         # Check for email sent marker
-        response = table.get_item(
+        response = dynamodb_client.get_item(
+            TableName=table_name,
             Key={
-                'workflow_id': email_key,
-                'account_id': 'EMAIL_SENT_MARKER'
-            }
+                'workflow_id': {'S': email_key},
+                'account_id': {'S': 'EMAIL_SENT_MARKER'}
+            },
+            ProjectionExpression='workflow_id'
         )
         
         return 'Item' in response
@@ -1123,8 +1203,7 @@ def mark_email_as_sent(email_key):
     """
     try:
         import time
-        from botocore.exceptions import ClientError
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
         table_name = os.environ.get('WORKFLOW_RESULTS_TABLE')
         table = dynamodb.Table(table_name)
         
@@ -1166,28 +1245,19 @@ def create_minimal_excel_fallback(events, account_ids):
     try:
         from openpyxl import Workbook
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Health Events Summary"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Health Events Summary")
         
         # Simple headers
-        ws['A1'] = "Account ID"
-        ws['B1'] = "Event Count"
-        ws['C1'] = "Status"
+        ws.append(["Account ID", "Event Count", "Status"])
         
         # Count events per account
-        account_event_counts = {}
-        for event in events:
-            account_id = event.get('accountId', 'unknown')
-            account_event_counts[account_id] = account_event_counts.get(account_id, 0) + 1
+        account_event_counts = Counter(event.get('accountId', 'unknown') for event in events)
         
         # Write data
-        row = 2
         for account_id in account_ids:
-            ws[f'A{row}'] = account_id
-            ws[f'B{row}'] = account_event_counts.get(account_id, 0)
-            ws[f'C{row}'] = "Report generation failed - manual review required"
-            row += 1
+            ws.append([account_id, account_event_counts[account_id],
+                       "Report generation failed - manual review required"])
         
         # Save to buffer
         excel_buffer = BytesIO()
@@ -1207,7 +1277,7 @@ def create_minimal_html_fallback(account_ids, email_type):
     Create minimal HTML content when full HTML generation fails
     """
     try:
-        html_content = f"""
+        html_parts = [f"""
         <html>
         <body>
         <h2>AWS Health Events Analysis - {email_type.title()}</h2>
@@ -1216,15 +1286,14 @@ def create_minimal_html_fallback(account_ids, email_type):
         
         <h3>Accounts Processed:</h3>
         <ul>
-        """
+        """]
         
-        for account_id in account_ids[:10]:  # Limit to first 10 accounts
-            html_content += f"<li>{account_id}</li>"
+        html_parts.extend(f"<li>{account_id}</li>" for account_id in account_ids[:10])  # Limit to first 10 accounts
         
         if len(account_ids) > 10:
-            html_content += f"<li>... and {len(account_ids) - 10} more accounts</li>"
+            html_parts.append(f"<li>... and {len(account_ids) - 10} more accounts</li>")
         
-        html_content += """
+        html_parts.append("""
         </ul>
         
         <p><strong>Action Required:</strong> Please check the attached Excel file for event details, or contact your AWS administrator for assistance.</p>
@@ -1232,9 +1301,9 @@ def create_minimal_html_fallback(account_ids, email_type):
         <p>This email was generated automatically by the AWS Health Events Analyzer.</p>
         </body>
         </html>
-        """
+        """)
         
-        return html_content
+        return ''.join(html_parts)
         
     except Exception as e:
         print(f"Error creating minimal HTML fallback: {e}")
@@ -1261,9 +1330,6 @@ def determine_email_status(email_mapping):
             else:
                 return 'Sent to default recipients'
         
-        # Sandbox mode - check verification status
-        ses_client = boto3.client('ses')
-        
         # Get the actual email addresses to check
         if email_mapping:
             emails_to_check = [email_mapping]
@@ -1274,25 +1340,9 @@ def determine_email_status(email_mapping):
             emails_to_check = [email.strip() for email in default_recipients if email.strip()]
             base_status = 'default recipients'
         
-        # Check verification status for all relevant emails
-        unverified_emails = []
-        for email in emails_to_check:
-            if email:
-                try:
-                    response = ses_client.get_identity_verification_attributes(
-                        Identities=[email]
-                    )
-                    
-                    verification_status = response.get('VerificationAttributes', {}).get(
-                        email, {}
-                    ).get('VerificationStatus', 'NotStarted')
-                    
-                    if verification_status != 'Success':
-                        unverified_emails.append(email)
-                        
-                except Exception as e:
-                    print(f"Could not verify {email}: {e}")
-                    unverified_emails.append(email)
+        # Check verification status for all relevant emails (sandbox mode)
+        verification_statuses = get_verification_statuses(emails_to_check)
+        unverified_emails = [email for email in emails_to_check if verification_statuses.get(email) != 'Success']
         
         # Determine status based on verification results
         if unverified_emails:
@@ -1330,9 +1380,11 @@ def send_email_with_attachment(recipients, subject, html_content, excel_buffer,
     try:
         sender = os.environ['SENDER_EMAIL']
         
-        # Generate filename
-        current_date = datetime.now().strftime('%Y-%m-%d')
-        current_time = datetime.now().strftime('%H-%M')
+        # Generate filename - date and time come from one clock read so they cannot
+        # straddle midnight
+        now = datetime.now()
+        current_date = now.strftime('%Y-%m-%d')
+        current_time = now.strftime('%H-%M')
         filename_template = os.environ.get('EXCEL_FILENAME_TEMPLATE', 'AWS_Health_Events_Analysis_{date}_{time}.xlsx')
         filename = filename_template.format(date=current_date, time=current_time)
         
@@ -1340,20 +1392,15 @@ def send_email_with_attachment(recipients, subject, html_content, excel_buffer,
             # Insert suffix before .xlsx
             filename = filename.replace('.xlsx', f'{filename_suffix}.xlsx')
         
-        # Create SES client
-        ses_client = boto3.client('ses')
+        ses_client = get_ses_client()
         
         # Prepare all recipients for SES (TO + CC combined)
         cc_recipients = cc_recipients or []
         all_recipients = recipients + cc_recipients
         
         # Check SES mode and verify recipients if needed
-        if should_verify_recipient_email():
-            print("SES is in sandbox mode - checking recipient verification")
-            unverified = check_recipient_verification(ses_client, all_recipients)
-            if unverified:
-                print(f"Warning: Unverified recipients: {unverified}")
-                return False
+        if not recipients_can_receive(all_recipients):
+            return False
         
         # Create raw email with attachment (CC header is set inside for display)
         raw_message = create_raw_email_with_attachment(
@@ -1376,24 +1423,48 @@ def send_email_with_attachment(recipients, subject, html_content, excel_buffer,
         print(f"Email sent successfully. MessageId: {response['MessageId']}")
         return True
         
+    except ClientError as e:
+        # SES rejections (unverified sender, throttling, quota) are fully described by
+        # the error code and message - a stack trace adds nothing but log volume
+        print(f"Error sending email: {e.response['Error']['Code']} - {e.response['Error']['Message']}")
+        return False
     except Exception as e:
         print(f"Error sending email: {str(e)}")
         traceback.print_exc()
         return False
 
 
+@lru_cache(maxsize=1)
+def get_ses_client():
+    """
+    Get the SES client, created once per Lambda container
+    """
+    return boto3.client('ses', config=AWS_CLIENT_CONFIG)
+
+
 def should_verify_recipient_email():
     """
     Check if SES is in sandbox mode
+    
+    SES_SANDBOX_MODE=true/false skips the get_send_quota probe entirely.
     """
+    ses_sandbox_mode = os.environ.get('SES_SANDBOX_MODE', '').strip().lower()
+    if ses_sandbox_mode in ('true', 'false'):
+        return ses_sandbox_mode == 'true'
+    
+    if (_ses_sandbox_cache['value'] is not None
+            and time.time() - _ses_sandbox_cache['timestamp'] < SES_MODE_CACHE_TTL_SECONDS):
+        return _ses_sandbox_cache['value']
+    
     try:
-        ses_client = boto3.client('ses')
-        quota = ses_client.get_send_quota()
+        quota = get_ses_client().get_send_quota()
         
         max_24_hour_send = quota.get('Max24HourSend', 0)
         max_send_rate = quota.get('MaxSendRate', 0)
         
         is_sandbox = (max_24_hour_send <= 200 and max_send_rate <= 1)
+        _ses_sandbox_cache['value'] = is_sandbox
+        _ses_sandbox_cache['timestamp'] = time.time()
         return is_sandbox
         
     except Exception as e:
@@ -1401,30 +1472,81 @@ def should_verify_recipient_email():
         return True  # Default to sandbox mode for safety
 
 
-def check_recipient_verification(ses_client, recipients):
+def recipients_can_receive(recipients):
+    """
+    Check that SES will deliver to all recipients
+    
+    Always true outside the SES sandbox. Callers check this before building the
+    report, since a send to an unverified recipient would fail anyway; the
+    verification cache keeps the repeat check in send_email_with_attachment cheap.
+    """
+    if not should_verify_recipient_email():
+        return True
+    
+    print("SES is in sandbox mode - checking recipient verification")
+    unverified = check_recipient_verification(recipients)
+    if unverified:
+        print(f"Warning: Unverified recipients: {unverified}")
+        return False
+    return True
+
+
+def check_recipient_verification(recipients):
     """
     Check which recipients are not verified
     """
+    verification_statuses = get_verification_statuses(recipients)
     unverified = []
     
     for recipient in recipients:
+        verification_status = verification_statuses.get(recipient, 'NotStarted')
+        if verification_status == 'CheckFailed':
+            unverified.append(f"{recipient} (check failed)")
+        elif verification_status != 'Success':
+            unverified.append(f"{recipient} ({verification_status})")
+    
+    return unverified
+
+
+def get_verification_statuses(emails):
+    """
+    Get SES verification statuses for email addresses
+    
+    Uncached addresses are looked up together, up to SES_VERIFICATION_BATCH_SIZE per
+    get_identity_verification_attributes call, and the results are cached for the
+    warm container. Addresses whose lookup failed map to 'CheckFailed' and are not
+    cached, so they are retried next time.
+    
+    Returns:
+        dict: Email address -> verification status
+    """
+    now = time.time()
+    statuses = {}
+    to_check = []
+    
+    for email in dict.fromkeys(email for email in emails if email):
+        cached = _ses_verification_cache.get(email)
+        if cached and now - cached[1] < SES_VERIFICATION_CACHE_TTL_SECONDS:
+            statuses[email] = cached[0]
+        else:
+            to_check.append(email)
+    
+    for start in range(0, len(to_check), SES_VERIFICATION_BATCH_SIZE):
+        batch = to_check[start:start + SES_VERIFICATION_BATCH_SIZE]
         try:
-            response = ses_client.get_identity_verification_attributes(
-                Identities=[recipient]
-            )
+            response = get_ses_client().get_identity_verification_attributes(Identities=batch)
+            attributes = response.get('VerificationAttributes', {})
             
-            verification_status = response.get('VerificationAttributes', {}).get(
-                recipient, {}
-            ).get('VerificationStatus', 'NotStarted')
-            
-            if verification_status != 'Success':
-                unverified.append(f"{recipient} ({verification_status})")
+            for email in batch:
+                status = attributes.get(email, {}).get('VerificationStatus', 'NotStarted')
+                statuses[email] = status
+                _ses_verification_cache[email] = (status, now)
                 
         except Exception as e:
-            print(f"Could not verify {recipient}: {e}")
-            unverified.append(f"{recipient} (check failed)")
+            print(f"Could not verify {', '.join(batch)}: {e}")
+            statuses.update(dict.fromkeys(batch, 'CheckFailed'))
     
-    return unverified
+    return statuses
 
 
 def create_raw_email_with_attachment(sender, recipients, subject, html_body, attachment_data, attachment_name, cc_recipients=None):
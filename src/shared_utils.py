@@ -6,10 +6,36 @@ import json
 import os
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from collections import defaultdict
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# Adaptive retries absorb throttling from Organizations, Health and DynamoDB fan-out;
+# the connection pool is sized above the thread pools sharing a client
+AWS_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=3,
+    read_timeout=10,
+    tcp_keepalive=True,
+    max_pool_connections=32
+)
+
+# Account mappings change rarely, so warm Lambda containers reuse them briefly
+MAPPING_CACHE_TTL_SECONDS = 300
+_organization_mapping_cache = {'value': None, 'timestamp': 0}
+
+# Combined mapping persisted to Lambda ephemeral storage between invocations
+MAPPING_CACHE_FILE = '/tmp/account_email_mapping.json'
+
+# Concurrent describe_affected_accounts_for_organization lookups
+AFFECTED_ACCOUNTS_MAX_WORKERS = 16
+
+# Parallel scan segments for the custom account-email mapping table
+MAPPING_SCAN_SEGMENTS = 4
+
 
 class IncompleteWorkflowException(Exception):
     """Custom exception for incomplete workflows"""
@@ -21,12 +47,36 @@ def generate_workflow_id():
     return f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-{int(time.time())}"
 
 
+@lru_cache(maxsize=1)
+def get_health_client():
+    """
+    Get the AWS Health client (must be us-east-1), created once per Lambda container
+    """
+    return boto3.client('health', region_name='us-east-1', config=AWS_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def get_organizations_client():
+    """
+    Get the AWS Organizations client, created once per Lambda container
+    """
+    return boto3.client('organizations', config=AWS_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def get_dynamodb_client():
+    """
+    Get the low-level DynamoDB client, created once per Lambda container
+    """
+    return boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
+
+
 def get_organization_account_email_mapping():
     """
     Get account-to-email mapping from AWS Organizations by looking up account contact information.
     
     Returns:
-        tuple: (account_to_email_mapping, email_to_accounts_mapping)
+        tuple: (account_to_email_mapping, email_to_accounts_mapping), or None if the lookup failed
     """
     account_to_email = {}
     email_to_accounts = defaultdict(list)
@@ -36,30 +86,43 @@ def get_organization_account_email_mapping():
         print("Organization account email mapping is disabled")
         return account_to_email, dict(email_to_accounts)
     
+    cached = _organization_mapping_cache['value']
+    if cached is not None and time.time() - _organization_mapping_cache['timestamp'] < MAPPING_CACHE_TTL_SECONDS:
+        print(f"Using cached Organizations mapping ({len(cached[0])} accounts)")
+        return cached
+    
     try:
         print("Fetching account email mappings from AWS Organizations...")
         
-        # Create Organizations client
-        org_client = boto3.client('organizations')
+        # Get Organizations client
+        org_client = get_organizations_client()
         
         # List all accounts in the organization
         paginator = org_client.get_paginator('list_accounts')
         
+        # list_accounts already returns names, so no per-account describe calls are needed
+        accounts_without_email = []
+        
         for page in paginator.paginate():
             for account in page['Accounts']:
                 account_id = account['Id']
-                account_name = account.get('Name', 'Unknown')
                 account_email = account.get('Email')
                 
                 if account_email:
                     account_to_email[account_id] = account_email
                     email_to_accounts[account_email].append(account_id)
-                    print(f"Account mapping: {account_id} ({account_name}) -> {account_email}")
                 else:
-                    print(f"Warning: No email found for account {account_id} ({account_name})")
+                    accounts_without_email.append(f"{account_id} ({account.get('Name', 'Unknown')})")
+        
+        if accounts_without_email:
+            print(f"Warning: No email found for {len(accounts_without_email)} accounts: {', '.join(accounts_without_email)}")
         
         print(f"Retrieved {len(account_to_email)} account email mappings from Organizations")
         
+        _organization_mapping_cache['value'] = (account_to_email, dict(email_to_accounts))
+        _organization_mapping_cache['timestamp'] = time.time()
+        return _organization_mapping_cache['value']
+        
     except ClientError as e:
         error_code = e.response['Error']['Code']
         if error_code == 'AccessDeniedException':
@@ -72,7 +135,36 @@ def get_organization_account_email_mapping():
         print(f"Error fetching account mappings from Organizations: {str(e)}")
         traceback.print_exc()
     
-    return account_to_email, dict(email_to_accounts)
+    return None
+
+
+def scan_table_segment(dynamodb_client, table_name, segment, total_segments):
+    """
+    Scan one segment of a DynamoDB table, following pagination
+    
+    Args:
+        dynamodb_client: DynamoDB client
+        table_name (str): Table to scan
+        segment (int): Segment number to scan
+        total_segments (int): Total number of parallel segments
+        
+    Returns:
+        list: Raw DynamoDB items in this segment
+    """
+    paginator = dynamodb_client.get_paginator('scan')
+    items = []
+    
+    page_iterator = paginator.paginate(
+        TableName=table_name,
+        Segment=segment,
+        TotalSegments=total_segments,
+        ProjectionExpression='AccountId, Email'
+    )
+    
+    for page in page_iterator:
+        items.extend(page.get('Items', []))
+    
+    return items
 
 
 def get_custom_account_email_mapping_from_dynamodb():
@@ -80,7 +172,7 @@ def get_custom_account_email_mapping_from_dynamodb():
     Fetch custom account-email mapping from DynamoDB table
     
     Returns:
-        tuple: (account_to_email_mapping, email_to_accounts_mapping)
+        tuple: (account_to_email_mapping, email_to_accounts_mapping), or None if the lookup failed
     """
     use_custom_mapping = os.environ.get('USE_CUSTOM_ACCOUNT_EMAIL_MAPPING', 'false').lower() == 'true'
     if not use_custom_mapping:
@@ -94,18 +186,16 @@ def get_custom_account_email_mapping_from_dynamodb():
     
     try:
         print(f"Fetching custom account email mapping from DynamoDB table: {table_name}")
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-        
-        # Scan the table to get all mappings
-        response = table.scan()
-        items = response['Items']
+        # Low-level client: thread-safe, and string attributes need no Resource deserialization
+        dynamodb_client = get_dynamodb_client()
         
-        # Handle pagination if there are many items
-        while 'LastEvaluatedKey' in response:
-            print("Fetching additional items from DynamoDB (pagination)...")
-            response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response['Items'])
+        # Scan the table to get all mappings, one parallel segment per worker
+        with ThreadPoolExecutor(max_workers=MAPPING_SCAN_SEGMENTS) as executor:
+            segment_items = executor.map(
+                lambda segment: scan_table_segment(dynamodb_client, table_name, segment, MAPPING_SCAN_SEGMENTS),
+                range(MAPPING_SCAN_SEGMENTS)
+            )
+            items = [item for segment in segment_items for item in segment]
         
         print(f"Successfully loaded {len(items)} account mappings from DynamoDB")
         
@@ -113,17 +203,22 @@ def get_custom_account_email_mapping_from_dynamodb():
         account_to_email = {}
         email_to_accounts = defaultdict(list)
         
+        invalid_mappings = []
+        
         for item in items:
-            account_id = item.get('AccountId', '').strip()
-            email = item.get('Email', '').strip()
+            account_id = item.get('AccountId', {}).get('S', '').strip()
+            email = item.get('Email', {}).get('S', '').strip()
             
             if not account_id or not email:
-                print(f"Warning: Skipping invalid mapping - AccountId: '{account_id}', Email: '{email}'")
+                invalid_mappings.append(f"AccountId: '{account_id}', Email: '{email}'")
                 continue
             
             account_to_email[account_id] = email
             email_to_accounts[email].append(account_id)
-            print(f"Custom mapping: {account_id} -> {email}")
+        
+        if invalid_mappings:
+            print(f"Warning: Skipped {len(invalid_mappings)} invalid mappings: {'; '.join(invalid_mappings)}")
+        print(f"Loaded {len(account_to_email)} custom mappings across {len(email_to_accounts)} email addresses")
         
         return account_to_email, dict(email_to_accounts)
         
@@ -135,11 +230,11 @@ def get_custom_account_email_mapping_from_dynamodb():
             print(f"Access denied when trying to read DynamoDB table {table_name}")
         else:
             print(f"Error accessing DynamoDB table: {error_code} - {e.response['Error']['Message']}")
-        return {}, {}
+        return None
     except Exception as e:
         print(f"Error fetching custom mapping from DynamoDB: {str(e)}")
         traceback.print_exc()
-        return {}, {}
+        return None
 
 
 def get_combined_account_email_mapping():
@@ -159,20 +254,33 @@ def get_combined_account_email_mapping():
     print(f"  - Custom DynamoDB mapping: {'ENABLED' if use_custom else 'DISABLED'}")
     print(f"  - Organizations mapping: {'ENABLED' if use_org else 'DISABLED'}")
     
-    # Initialize combined mappings
+    cache_key = f"custom={use_custom},org={use_org}"
+    cached_mapping = load_cached_account_email_mapping(cache_key)
+    if cached_mapping:
+        return cached_mapping
+    
+    # Initialize combined mappings - account IDs per email are kept in insertion-ordered
+    # dicts (used as ordered sets) so overrides can add and remove accounts in O(1)
     combined_account_to_email = {}
-    combined_email_to_accounts = defaultdict(list)
+    combined_email_to_accounts = {}
     mapping_sources = {}  # Track source for each account
     
+    # A partial mapping is still used for this run, but never cached
+    lookup_failed = False
+    
     # Step 1: Get Organizations mapping as base (if enabled)
     if use_org:
         print("Fetching AWS Organizations mapping as base...")
-        org_account_to_email, org_email_to_accounts = get_organization_account_email_mapping()
+        org_mapping = get_organization_account_email_mapping()
+        if org_mapping is None:
+            lookup_failed = True
+            org_mapping = ({}, {})
+        org_account_to_email, org_email_to_accounts = org_mapping
         
         if org_account_to_email:
             combined_account_to_email.update(org_account_to_email)
             for email, accounts in org_email_to_accounts.items():
-                combined_email_to_accounts[email].extend(accounts)
+                combined_email_to_accounts.setdefault(email, {}).update(dict.fromkeys(accounts))
             # Mark all as organizations source
             for account_id in org_account_to_email:
                 mapping_sources[account_id] = 'organizations'
@@ -181,31 +289,34 @@ def get_combined_account_email_mapping():
     # Step 2: Override with DynamoDB mapping (if enabled)
     if use_custom:
         print("Fetching custom DynamoDB mapping for overrides...")
-        custom_account_to_email, custom_email_to_accounts = get_custom_account_email_mapping_from_dynamodb()
+        custom_mapping = get_custom_account_email_mapping_from_dynamodb()
+        if custom_mapping is None:
+            lookup_failed = True
+            custom_mapping = ({}, {})
+        custom_account_to_email, custom_email_to_accounts = custom_mapping
         
         if custom_account_to_email:
-            # Track overrides for logging
-            overridden_accounts = []
-            new_accounts = []
+            # Track overrides for logging - only the counts are reported
+            overridden_count = 0
+            new_count = 0
             
             for account_id, new_email in custom_account_to_email.items():
                 old_email = combined_account_to_email.get(account_id)
                 
                 if old_email and old_email != new_email:
                     # This account exists in Organizations but with different email
-                    overridden_accounts.append(f"{account_id}: {old_email} -> {new_email}")
+                    overridden_count += 1
                     mapping_sources[account_id] = 'combined'  # Organizations overridden by custom
                     # Remove from old email list
-                    if old_email in combined_email_to_accounts:
-                        combined_email_to_accounts[old_email] = [
-                            acc for acc in combined_email_to_accounts[old_email] if acc != account_id
-                        ]
+                    old_email_accounts = combined_email_to_accounts.get(old_email)
+                    if old_email_accounts is not None:
+                        old_email_accounts.pop(account_id, None)
                         # Clean up empty email lists
-                        if not combined_email_to_accounts[old_email]:
+                        if not old_email_accounts:
                             del combined_email_to_accounts[old_email]
                 elif not old_email:
                     # This is a new account not in Organizations
-                    new_accounts.append(f"{account_id} -> {new_email}")
+                    new_count += 1
                     mapping_sources[account_id] = 'custom'
                 else:
                     # Same email in both sources
@@ -213,29 +324,96 @@ def get_combined_account_email_mapping():
                 
                 # Apply the DynamoDB mapping
                 combined_account_to_email[account_id] = new_email
-                if account_id not in combined_email_to_accounts[new_email]:
-                    combined_email_to_accounts[new_email].append(account_id)
+                combined_email_to_accounts.setdefault(new_email, {})[account_id] = None
             
             print(f"Added {len(custom_account_to_email)} accounts from DynamoDB mapping")
             
-            if overridden_accounts:
-                print(f"DynamoDB overrode {len(overridden_accounts)} Organizations mappings")
+            if overridden_count:
+                print(f"DynamoDB overrode {overridden_count} Organizations mappings")
             
-            if new_accounts:
-                print(f"DynamoDB added {len(new_accounts)} new accounts not in Organizations")
+            if new_count:
+                print(f"DynamoDB added {new_count} new accounts not in Organizations")
     
-    # Convert defaultdict back to regular dict
-    combined_email_to_accounts = dict(combined_email_to_accounts)
+    # Materialize the account sets back into lists
+    combined_email_to_accounts = {
+        email: list(accounts) for email, accounts in combined_email_to_accounts.items()
+    }
     
     # Summary logging
     if combined_account_to_email:
         print(f"Final combined mapping: {len(combined_account_to_email)} accounts across {len(combined_email_to_accounts)} email addresses")
+        if lookup_failed:
+            print("Not caching the combined mapping because a mapping source failed to load")
+        else:
+            save_cached_account_email_mapping(cache_key, combined_account_to_email, combined_email_to_accounts, mapping_sources)
         return combined_account_to_email, combined_email_to_accounts, mapping_sources
     else:
         print("No account-email mapping configured - all events will go to default recipients")
         return {}, {}, {}
 
 
+def load_cached_account_email_mapping(cache_key):
+    """
+    Load the combined account-email mapping from ephemeral storage if still fresh
+    
+    Returns:
+        tuple or None: (account_to_email, email_to_accounts, mapping_sources)
+    """
+    try:
+        if time.time() - os.path.getmtime(MAPPING_CACHE_FILE) >= MAPPING_CACHE_TTL_SECONDS:
+            return None
+        
+        with open(MAPPING_CACHE_FILE) as f:
+            cached = json.load(f)
+        
+        if cached.get('cache_key') != cache_key:
+            return None
+        
+        print(f"Using cached account email mapping ({len(cached['account_to_email'])} accounts)")
+        return cached['account_to_email'], cached['email_to_accounts'], cached['mapping_sources']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached_account_email_mapping(cache_key, account_to_email, email_to_accounts, mapping_sources):
+    """
+    Persist the combined account-email mapping to ephemeral storage
+    """
+    try:
+        temp_file = f"{MAPPING_CACHE_FILE}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({
+                'cache_key': cache_key,
+                'account_to_email': account_to_email,
+                'email_to_accounts': email_to_accounts,
+                'mapping_sources': mapping_sources
+            }, f)
+        os.replace(temp_file, MAPPING_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Could not cache account email mapping: {e}")
+
+
+def fetch_affected_accounts(health_client, event):
+    """
+    Fetch the affected account IDs for an organization health event
+    
+    Args:
+        health_client: Health API client
+        event (dict): Event dictionary
+        
+    Returns:
+        list: Affected account IDs, or None if the lookup failed
+    """
+    try:
+        response = health_client.describe_affected_accounts_for_organization(
+            eventArn=event.get('arn', '')
+        )
+        return response.get('affectedAccounts', [])
+    except Exception as e:
+        print(f"Error fetching affected accounts for event {event.get('eventTypeCode', 'unknown')}: {str(e)}")
+        return None
+
+
 def expand_events_by_account(events):
     """
     Expands events that affect multiple accounts into separate event records for each account.
@@ -248,9 +426,8 @@ def expand_events_by_account(events):
         list: Expanded list of event dictionaries
     """
     expanded_events = []
-    
-    # Health API should go to us-east-1
-    health_client = boto3.client('health', region_name='us-east-1')
+    account_id_strs = []
+    events_to_lookup = []
     
     for event in events:
         # Get the account ID string - check multiple possible sources
@@ -261,54 +438,87 @@ def expand_events_by_account(events):
             affected_entities = event.get('affectedEntities', [])
             if affected_entities and isinstance(affected_entities, list):
                 # Extract account IDs from affected entities
-                account_ids = []
-                for entity in affected_entities:
-                    if isinstance(entity, dict) and 'entityValue' in entity:
-                        account_ids.append(entity['entityValue'])
-                if account_ids:
-                    account_id_str = ', '.join(account_ids)
+                account_id_str = ', '.join(
+                    entity['entityValue'] for entity in affected_entities
+                    if isinstance(entity, dict) and 'entityValue' in entity
+                )
         
+        # If no account ID or it's N/A, the affected accounts must be fetched
+        if not account_id_str or account_id_str == 'N/A':
+            events_to_lookup.append(event)
+        
+        account_id_strs.append(account_id_str)
+    
+    # Affected accounts depend only on the event ARN, so look each ARN up once
+    # (CSV input can repeat an event across rows); events without an ARN cannot be looked up
+    events_by_lookup_arn = {}
+    for event in events_to_lookup:
         event_arn = event.get('arn', '')
+        if event_arn:
+            events_by_lookup_arn.setdefault(event_arn, event)
+    
+    # Fetch affected accounts concurrently - the lookups are independent API round trips
+    affected_accounts_by_arn = {}
+    if events_by_lookup_arn:
+        print(f"Fetching affected accounts for {len(events_by_lookup_arn)} events")
         
-        # If no account ID or it's N/A, try to fetch affected accounts
-        if not account_id_str or account_id_str == 'N/A':
-            try:
-                print(f"Fetching affected accounts for event: {event.get('eventTypeCode', 'unknown')}")
-                response = health_client.describe_affected_accounts_for_organization(
-                    eventArn=event_arn
-                )
-                affected_accounts = response.get('affectedAccounts', [])
-                
-                if affected_accounts:
-                    # If multiple accounts are affected, join them with commas
-                    account_id_str = ', '.join(affected_accounts)
-                    event['accountId'] = account_id_str  # Update the event with the account IDs
-                    print(f"Found affected accounts: {account_id_str}")
-                else:
-                    print("No affected accounts found")
-                    expanded_events.append(event)  # Keep the event as is
-                    continue
-            except Exception as e:
-                print(f"Error fetching affected accounts: {str(e)}")
-                expanded_events.append(event)  # Keep the event as is
+        # Health API should go to us-east-1
+        health_client = get_health_client()
+        
+        with ThreadPoolExecutor(max_workers=AFFECTED_ACCOUNTS_MAX_WORKERS) as executor:
+            lookups = executor.map(lambda e: fetch_affected_accounts(health_client, e), events_by_lookup_arn.values())
+            affected_accounts_by_arn = dict(zip(events_by_lookup_arn, lookups))
+    
+    lookup_event_ids = {id(event) for event in events_to_lookup}
+    
+    seen_event_accounts = set()
+    duplicate_count = 0
+    multi_account_count = 0
+    
+    for event, account_id_str in zip(events, account_id_strs):
+        event_arn = event.get('arn', '')
+        
+        if id(event) in lookup_event_ids:
+            affected_accounts = affected_accounts_by_arn.get(event_arn)
+            if not affected_accounts:
+                # Lookup failed or found nothing - keep the event as is
+                expanded_events.append(event)
                 continue
+            
+            # If multiple accounts are affected, join them with commas
+            account_id_str = ', '.join(affected_accounts)
+            event['accountId'] = account_id_str  # Update the event with the account IDs
         
         # If no comma in the string, it's a single account or none
         if ',' not in account_id_str:
+            if event_arn and account_id_str:
+                event_key = (event_arn, account_id_str.strip())
+                if event_key in seen_event_accounts:
+                    duplicate_count += 1
+                    continue
+                seen_event_accounts.add(event_key)
             expanded_events.append(event)
             continue
         
         # Split the account IDs and create a separate event for each
         account_ids = [aid.strip() for aid in account_id_str.split(',')]
-        print(f"Expanding event {event_arn} for {len(account_ids)} accounts: {account_ids}")
+        multi_account_count += 1
         
         for account_id in account_ids:
+            # Skip event/account pairs that were already emitted
+            event_key = (event_arn, account_id)
+            if event_arn and event_key in seen_event_accounts:
+                duplicate_count += 1
+                continue
+            seen_event_accounts.add(event_key)
+            
             # Create a copy of the event for this specific account
-            account_event = event.copy()
-            account_event['accountId'] = account_id
-            expanded_events.append(account_event)
+            expanded_events.append({**event, 'accountId': account_id})
     
-    print(f"Expanded {len(events)} events to {len(expanded_events)} account-specific events")
+    if duplicate_count:
+        print(f"Skipped {duplicate_count} duplicate event/account pairs")
+    print(f"Expanded {len(events)} events ({multi_account_count} multi-account) "
+          f"to {len(expanded_events)} account-specific events")
     return expanded_events
 
 
@@ -345,7 +555,7 @@ def store_workflow_result(workflow_id, account_id, result_data, ttl_days=7):
     if not table_name:
         raise ValueError("WORKFLOW_RESULTS_TABLE environment variable not set")
     
-    dynamodb = boto3.resource('dynamodb')
+    dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
     table = dynamodb.Table(table_name)
     
     # Calculate TTL timestamp
@@ -378,15 +588,39 @@ def get_workflow_results(workflow_id):
     if not table_name:
         raise ValueError("WORKFLOW_RESULTS_TABLE environment variable not set")
     
-    dynamodb = boto3.resource('dynamodb')
+    dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
     table = dynamodb.Table(table_name)
     
-    response = table.query(
-        KeyConditionExpression='workflow_id = :wid',
-        ExpressionAttributeValues={':wid': workflow_id}
-    )
+    return query_workflow_items(table, workflow_id)
+
+
+def query_workflow_items(table, workflow_id):
+    """
+    Query all items for a workflow, following pagination
     
-    return response['Items']
+    A single Query call returns at most 1 MB of data, which large workflows
+    exceed once processed events are stored with each account result.
+    
+    Args:
+        table: DynamoDB Table resource
+        workflow_id (str): Workflow identifier
+        
+    Returns:
+        list: List of result items
+    """
+    query_kwargs = {
+        'KeyConditionExpression': 'workflow_id = :wid',
+        'ExpressionAttributeValues': {':wid': workflow_id}
+    }
+    
+    response = table.query(**query_kwargs)
+    items = response['Items']
+    
+    while 'LastEvaluatedKey' in response:
+        response = table.query(ExclusiveStartKey=response['LastEvaluatedKey'], **query_kwargs)
+        items.extend(response['Items'])
+    
+    return items
 
 
 def count_completed_results(workflow_id):
@@ -414,18 +648,15 @@ def cleanup_workflow_results(workflow_id):
     if not table_name:
         raise ValueError("WORKFLOW_RESULTS_TABLE environment variable not set")
     
-    dynamodb = boto3.resource('dynamodb')
+    dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
     table = dynamodb.Table(table_name)
     
     # Get all items for this workflow
-    response = table.query(
-        KeyConditionExpression='workflow_id = :wid',
-        ExpressionAttributeValues={':wid': workflow_id}
-    )
+    items = query_workflow_items(table, workflow_id)
     
     # Batch delete items
     with table.batch_writer() as batch:
-        for item in response['Items']:
+        for item in items:
             batch.delete_item(
                 Key={
                     'workflow_id': item['workflow_id'],
@@ -433,4 +664,4 @@ def cleanup_workflow_results(workflow_id):
                 }
             )
     
-    print(f"Cleaned up {len(response['Items'])} items for workflow {workflow_id}")
\ No newline at end of file
+    print(f"Cleaned up {len(items)} items for workflow {workflow_id}")
\ No newline at end of file
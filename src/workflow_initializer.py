@@ -9,14 +9,41 @@ import os
 import traceback
 import csv
 import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from shared_utils import (
+    AWS_CLIENT_CONFIG,
     generate_workflow_id,
     get_combined_account_email_mapping,
+    get_dynamodb_client,
+    get_health_client,
+    get_organizations_client,
     expand_events_by_account,
     group_events_by_account
 )
 
+# CSV columns copied as-is onto health events (adjust to your CSV structure)
+CSV_EVENT_FIELDS = (
+    'arn', 'service', 'eventTypeCode', 'eventTypeCategory', 'region',
+    'startTime', 'endTime', 'lastUpdatedTime', 'statusCode'
+)
+
+# Health API query settings, parsed once per container
+ANALYSIS_WINDOW_DAYS = int(os.environ.get('ANALYSIS_WINDOW_DAYS', '8'))
+EVENT_CATEGORIES = [cat.strip() for cat in os.environ.get('EVENT_CATEGORIES', '').split(',') if cat.strip()]
+EXCLUDED_SERVICES = frozenset(svc.strip() for svc in os.environ.get('EXCLUDED_SERVICES', '').split(',') if svc.strip())
+
+# Largest page the Health API allows for describe_events_for_organization
+HEALTH_EVENTS_PAGE_SIZE = 100
+
+# Concurrent describe_event_details_for_organization batch lookups
+EVENT_DETAILS_MAX_WORKERS = 8
+
+# Alternative CSV column names, in order of preference
+CSV_DESCRIPTION_COLUMNS = ('eventDescription', 'description', 'Description', 'message')
+CSV_ACCOUNT_COLUMNS = ('affectedAccount', 'accountId', 'account_id')
+
 
 def serialize_datetime_objects(obj):
     """
@@ -111,13 +138,15 @@ def workflow_initializer_handler(event, context):
         workflow_id = generate_workflow_id()
         print(f"Generated workflow ID: {workflow_id}")
         
-        # Get account email mappings (both org and custom)
-        print("Fetching account email mappings...")
-        account_to_email, email_to_accounts, mapping_sources = get_combined_account_email_mapping()
-        
-        # Get health events
-        print("Fetching health events...")
-        health_events = get_health_events()
+        # Account email mappings (both org and custom) and health events come from
+        # independent APIs, so fetch them concurrently
+        print("Fetching account email mappings and health events...")
+        create_workflow_clients()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mapping_future = executor.submit(get_combined_account_email_mapping)
+            health_events_future = executor.submit(get_health_events)
+            account_to_email, email_to_accounts, mapping_sources = mapping_future.result()
+            health_events = health_events_future.result()
         
         if not health_events:
             print("No health events found")
@@ -130,6 +159,9 @@ def workflow_initializer_handler(event, context):
             }
             return serialize_datetime_objects(result)
         
+        # Convert datetimes once on the unique events, before expansion copies them per account
+        health_events = serialize_datetime_objects(health_events)
+        
         # Expand events by account and group them
         print("Processing and grouping events by account...")
         expanded_events = expand_events_by_account(health_events)
@@ -154,8 +186,8 @@ def workflow_initializer_handler(event, context):
         print(f"Prepared {len(accounts_to_process)} accounts for processing")
         print(f"Total events: {len(expanded_events)}")
         
-        # Serialize datetime objects before returning
-        result = {
+        # Events were serialized before expansion, so the result is already JSON-safe
+        return {
             'workflow_id': workflow_id,
             'accounts': accounts_to_process,
             'total_accounts': len(accounts_to_process),
@@ -163,14 +195,38 @@ def workflow_initializer_handler(event, context):
             'total_events': len(expanded_events)
         }
         
-        return serialize_datetime_objects(result)
-        
     except Exception as e:
         print(f"Error in workflow initialization: {str(e)}")
         traceback.print_exc()
         raise
 
 
+def create_workflow_clients():
+    """
+    Create the clients used by the concurrent mapping and health event fetches
+    
+    Clients are thread-safe, but creating them from the default session is not,
+    so they are created on the calling thread before the work fans out.
+    """
+    if os.environ.get('USE_ORGANIZATION_ACCOUNT_EMAIL_MAPPING', 'false').lower() == 'true':
+        get_organizations_client()
+    if os.environ.get('USE_CUSTOM_ACCOUNT_EMAIL_MAPPING', 'false').lower() == 'true':
+        get_dynamodb_client()
+    
+    if os.environ.get('OVERRIDE_S3_HEALTH_EVENTS_ARN', ''):
+        get_s3_client()
+    else:
+        get_health_client()
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """
+    Get the S3 client, created once per Lambda container
+    """
+    return boto3.client('s3', config=AWS_CLIENT_CONFIG)
+
+
 def get_health_events():
     """
     Fetch health events from AWS Health API or S3 override
@@ -185,40 +241,51 @@ def get_health_events():
     return get_health_events_from_api()
 
 
-def parse_csv_health_events(csv_content):
+def parse_csv_health_events(csv_stream):
     """
     Parse CSV content and convert to health events format
+    
+    Args:
+        csv_stream: Text stream (or any iterable of lines) with the CSV content
     """
     try:
-        # Parse CSV content
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        # Parse CSV rows lazily from the stream
+        csv_reader = csv.DictReader(csv_stream)
         events = []
         
+        # Strip header names once so values can be used as-is without per-cell cleanup
+        fieldnames = [name.strip() for name in csv_reader.fieldnames or []]
+        csv_reader.fieldnames = fieldnames
+        
+        # Resolve the optional column alternatives once from the header row
+        description_columns = [col for col in CSV_DESCRIPTION_COLUMNS if col in fieldnames]
+        account_columns = [col for col in CSV_ACCOUNT_COLUMNS if col in fieldnames]
+        
+        blank_row_count = 0
+        
         for row in csv_reader:
-            # Convert CSV row to health event format
-            # Adjust field mappings based on your CSV structure
-            event = {
-                'arn': row.get('arn', ''),
-                'service': row.get('service', ''),
-                'eventTypeCode': row.get('eventTypeCode', ''),
-                'eventTypeCategory': row.get('eventTypeCategory', ''),
-                'region': row.get('region', ''),
-                'startTime': row.get('startTime', ''),
-                'endTime': row.get('endTime', ''),
-                'lastUpdatedTime': row.get('lastUpdatedTime', ''),
-                'statusCode': row.get('statusCode', ''),
-                'eventDescription': row.get('eventDescription', '') or row.get('description', '') or row.get('Description', '') or row.get('message', ''),
-                'affectedEntities': []
-            }
+            # Skip delimiter-only rows (e.g. trailing ",,," lines from spreadsheet exports)
+            if not any(row.values()):
+                blank_row_count += 1
+                continue
             
             # Add affected account if present - try multiple possible column names
-            affected_account = row.get('affectedAccount') or row.get('accountId') or row.get('account_id')
+            affected_account = next((row[col] for col in account_columns if row[col]), None)
+            
+            # Convert CSV row to health event format
+            event = {field: row.get(field, '') for field in CSV_EVENT_FIELDS}
+            event['eventDescription'] = next((row[col] for col in description_columns if row[col]), '')
+            event['affectedEntities'] = []
+            
             if affected_account:
                 event['accountId'] = affected_account
                 event['affectedEntities'] = [{'entityValue': affected_account}]
             
             events.append(event)
         
+        if blank_row_count:
+            print(f"Skipped {blank_row_count} blank CSV rows")
+        
         return events
         
     except Exception as e:
@@ -226,6 +293,25 @@ def parse_csv_health_events(csv_content):
         raise
 
 
+def parse_json_health_events(json_stream):
+    """
+    Parse JSON content and extract the health events list
+    
+    Args:
+        json_stream: Text stream with the JSON content
+    """
+    data = json.load(json_stream)
+    # Extract events from the JSON structure
+    return data.get('events', [])
+
+
+# Health event file parsers keyed by lower-case file extension
+HEALTH_EVENT_FILE_PARSERS = {
+    '.csv': parse_csv_health_events,
+    '.json': parse_json_health_events
+}
+
+
 def get_health_events_from_s3(s3_arn):
     """
     Get health events from S3 file
@@ -244,22 +330,17 @@ def get_health_events_from_s3(s3_arn):
         
         print(f"Downloading health events from S3: bucket={bucket_name}, key={key}")
         
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         response = s3_client.get_object(Bucket=bucket_name, Key=key)
         
-        # Determine file type and parse accordingly
-        if key.lower().endswith('.csv'):
-            # Handle CSV file
-            content = response['Body'].read().decode('utf-8-sig')  # Handle BOM
-            events = parse_csv_health_events(content)
-            print(f"Loaded {len(events)} events from CSV file")
-        else:
-            # Handle JSON file
-            content = response['Body'].read().decode('utf-8-sig')  # Handle BOM
-            data = json.loads(content)
-            # Extract events from the JSON structure
-            events = data.get('events', [])
-            print(f"Loaded {len(events)} events from JSON file")
+        # Determine file type from the extension (anything unrecognised is treated as JSON)
+        extension = os.path.splitext(key)[1].lower()
+        parse_events = HEALTH_EVENT_FILE_PARSERS.get(extension, parse_json_health_events)
+        
+        # Decode the body as it streams in; newline='' leaves line splitting to the csv
+        # module, so quoted fields may contain Unicode line separators
+        events = parse_events(io.TextIOWrapper(response['Body'], encoding='utf-8-sig', newline=''))  # Handle BOM
+        print(f"Loaded {len(events)} events from {extension or 'extensionless'} file")
         
         return events
         
@@ -275,11 +356,10 @@ def get_health_events_from_api():
     """
     try:
         # Health API client (must be us-east-1)
-        health_client = boto3.client('health', region_name='us-east-1')
+        health_client = get_health_client()
         
         # Calculate date range - look from ANALYSIS_WINDOW_DAYS ago into the future
-        analysis_window_days = int(os.environ.get('ANALYSIS_WINDOW_DAYS', '8'))
-        start_time = datetime.now(timezone.utc) - timedelta(days=analysis_window_days)
+        start_time = datetime.now(timezone.utc) - timedelta(days=ANALYSIS_WINDOW_DAYS)
         # No end_time cap - look into the future indefinitely
         
         print(f"Fetching health events from {start_time.isoformat()} onwards (no end date)")
@@ -294,34 +374,34 @@ def get_health_events_from_api():
         }
         
         # Add event categories filter if specified
-        event_categories = os.environ.get('EVENT_CATEGORIES', '')
-        if event_categories:
-            categories = [cat.strip() for cat in event_categories.split(',') if cat.strip()]
-            if categories:
-                event_filter['eventTypeCategories'] = categories
-                print(f"Filtering by categories: {categories}")
+        if EVENT_CATEGORIES:
+            event_filter['eventTypeCategories'] = EVENT_CATEGORIES
+            print(f"Filtering by categories: {EVENT_CATEGORIES}")
         
         # Add excluded services filter
-        excluded_services = os.environ.get('EXCLUDED_SERVICES', '')
-        if excluded_services:
-            excluded = [svc.strip() for svc in excluded_services.split(',') if svc.strip()]
-            if excluded:
-                print(f"Will exclude services: {excluded}")
+        if EXCLUDED_SERVICES:
+            print(f"Will exclude services: {sorted(EXCLUDED_SERVICES)}")
         
         # Fetch events using organization view
         print("Fetching events for organization...")
         paginator = health_client.get_paginator('describe_events_for_organization')
         
         all_events = []
-        for page in paginator.paginate(filter=event_filter):
-            events = page.get('events', [])
-            
-            # Filter out excluded services
-            if excluded_services:
-                excluded = [svc.strip() for svc in excluded_services.split(',') if svc.strip()]
-                events = [e for e in events if e.get('service', '') not in excluded]
-            
-            all_events.extend(events)
+        seen_arns = set()
+        for page in paginator.paginate(filter=event_filter, PaginationConfig={'PageSize': HEALTH_EVENTS_PAGE_SIZE}):
+            for event in page.get('events', []):
+                # Filter out excluded services
+                if event.get('service', '') in EXCLUDED_SERVICES:
+                    continue
+                
+                # Skip events already returned on an earlier page
+                event_arn = event.get('arn')
+                if event_arn:
+                    if event_arn in seen_arns:
+                        continue
+                    seen_arns.add(event_arn)
+                
+                all_events.append(event)
         
         print(f"Fetched {len(all_events)} health events from API")
         
@@ -345,44 +425,55 @@ def get_event_details(health_client, events):
     try:
         # Batch process event details (max 10 at a time)
         batch_size = 10
-        detailed_events = []
+        batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
         
-        for i in range(0, len(events), batch_size):
-            batch = events[i:i + batch_size]
-            event_arns = [event['arn'] for event in batch]
-            
-            try:
-                # Get event details
-                details_response = health_client.describe_event_details_for_organization(
-                    eventArns=event_arns
-                )
-                
-                # Create a mapping of ARN to details
-                details_map = {}
-                for detail in details_response.get('successfulSet', []):
-                    event_arn = detail['event']['arn']
-                    details_map[event_arn] = detail
-                
-                # Merge details with events
-                for event in batch:
-                    event_arn = event['arn']
-                    if event_arn in details_map:
-                        detail = details_map[event_arn]
-                        # Add description from event details
-                        event_description = detail.get('eventDescription', {})
-                        if event_description and 'latestDescription' in event_description:
-                            event['eventDescription'] = event_description['latestDescription']
-                    
-                    detailed_events.append(event)
-                    
-            except Exception as e:
-                print(f"Error getting details for batch: {str(e)}")
-                # Add events without details
-                detailed_events.extend(batch)
+        # Batches are independent API round trips, so fetch them concurrently
+        detailed_events = []
+        with ThreadPoolExecutor(max_workers=EVENT_DETAILS_MAX_WORKERS) as executor:
+            for batch_events in executor.map(lambda batch: fetch_event_details_batch(health_client, batch), batches):
+                detailed_events.extend(batch_events)
         
         print(f"Retrieved details for {len(detailed_events)} events")
         return detailed_events
         
     except Exception as e:
         print(f"Error in get_event_details: {str(e)}")
-        return events  # Return original events if details fetch fails
\ No newline at end of file
+        return events  # Return original events if details fetch fails
+
+
+def fetch_event_details_batch(health_client, batch):
+    """
+    Merge event descriptions into one batch of health events
+    
+    Returns the batch unchanged if the details lookup fails.
+    """
+    # The organization API takes per-event filters rather than a list of ARNs
+    event_filters = [{'eventArn': event['arn']} for event in batch]
+    
+    try:
+        # Get event details for the whole batch in one round trip
+        details_response = health_client.describe_event_details_for_organization(
+            organizationEventDetailFilters=event_filters
+        )
+        
+        # Create a mapping of ARN to details
+        details_map = {}
+        for detail in details_response.get('successfulSet', []):
+            event_arn = detail['event']['arn']
+            details_map[event_arn] = detail
+        
+        # Merge details with events
+        for event in batch:
+            event_arn = event['arn']
+            if event_arn in details_map:
+                detail = details_map[event_arn]
+                # Add description from event details
+                event_description = detail.get('eventDescription', {})
+                if event_description and 'latestDescription' in event_description:
+                    event['eventDescription'] = event_description['latestDescription']
+        
+    except Exception as e:
+        print(f"Error getting details for batch: {str(e)}")
+    
+    # Events without details are kept as is
+    return batch
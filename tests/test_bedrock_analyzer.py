@@ -0,0 +1,72 @@
+"""
+Tests for Bedrock response parsing and analysis caching
+"""
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import bedrock_analyzer
+
+
+def create_bedrock_response(text):
+    """
+    Build an invoke_model response carrying the given model text
+    """
+    body = json.dumps({'content': [{'type': 'text', 'text': text}]}).encode('utf-8')
+    return {'body': io.BytesIO(body)}
+
+
+class AnalysisCacheTest(unittest.TestCase):
+
+    message = {
+        'account_id': '123456789012',
+        'bedrock_payload': {'account_id': '123456789012'},
+        'processed_events': [{'service': 'EC2', 'region': 'us-east-1', 'eventTypeCode': 'AWS_EC2_MAINTENANCE'}]
+    }
+
+    def analyze(self, model_text):
+        client = mock.Mock()
+        client.invoke_model.return_value = create_bedrock_response(model_text)
+        with mock.patch.object(bedrock_analyzer, 'get_bedrock_runtime_client', return_value=client), \
+                mock.patch.object(bedrock_analyzer, 'store_cached_analysis') as store:
+            analysis = bedrock_analyzer.analyze_with_bedrock(self.message)
+        return analysis, store
+
+    def test_parsed_analysis_is_cached(self):
+        analysis, store = self.analyze('{"critical": false, "risk_level": "High", "summary": "Reboot required"}')
+
+        self.assertEqual(analysis['risk_level'], 'High')
+        store.assert_called_once()
+
+    def test_manually_extracted_analysis_is_not_cached(self):
+        # Truncated reply - not valid JSON, so fields are recovered by regex
+        analysis, store = self.analyze('{"critical": false, "risk_level": "High", "summary": "Reboot req')
+
+        self.assertTrue(analysis['manual_extraction'])
+        self.assertEqual(analysis['risk_level'], 'High')
+        store.assert_not_called()
+
+
+
+class ManualExtractionTest(unittest.TestCase):
+
+    def test_critical_false_takes_precedence(self):
+        analysis = bedrock_analyzer.extract_fields_manually(
+            '{"critical": true, "risk_level": "Medium"} ... corrected: {"critical": false')
+
+        self.assertFalse(analysis['critical'])
+
+    def test_critical_true_without_false(self):
+        analysis = bedrock_analyzer.extract_fields_manually('{"Critical":TRUE, "risk_level": "High"')
+
+        self.assertTrue(analysis['critical'])
+        self.assertEqual(analysis['risk_level'], 'Critical')
+
+
+if __name__ == '__main__':
+    unittest.main()